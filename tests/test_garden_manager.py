@@ -0,0 +1,30 @@
+"""
+Tests for garden config.yaml handling
+"""
+import pytest
+import yaml
+
+from trellis.utils.garden_manager import GardenManager, format_new_config
+
+
+@pytest.mark.parametrize('title', [
+    'Rocket 🚀 Notes',
+    'Café: "quoted" & #hashed',
+    "It's - a list? [no] {no}",
+    'yes',
+    '2024-01-01',
+    'Line separator and \x85next line',
+])
+def test_new_config_title_round_trips(tmp_path, title):
+    garden = tmp_path / 'garden'
+    garden.mkdir()
+    text = format_new_config(title, '2024-05-06')
+    (garden / 'config.yaml').write_text(text, encoding='utf-8')
+
+    # Both the pure-Python loader and the cached (libyaml when built) one
+    assert yaml.safe_load(text)['title'] == title
+    config = GardenManager(tmp_path).get_garden_config('garden')
+    assert config['title'] == title
+    assert config['description'] == ''
+    assert config['created_date'] == '2024-05-06'
+    assert config['order'] == 999
@@ -0,0 +1,125 @@
+"""
+Tests for IndexManager's deferred (dirty manifest) updates
+"""
+import shutil
+
+import pytest
+
+from trellis.models.content_index import ContentIndex
+from trellis.utils.index_manager import IndexManager
+from trellis.utils.search_index import SearchIndex
+
+
+def _write(path, title, body='Some text.'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {title}\n---\n{body}\n", encoding='utf-8')
+
+
+@pytest.fixture
+def garden_dir(tmp_path):
+    """Content laid out like GARDEN_DIR: root pages plus a 'blog' garden"""
+    content = tmp_path / 'garden'
+    (content / 'blog').mkdir(parents=True)
+    (content / 'blog' / 'config.yaml').write_text('title: Blog\n', encoding='utf-8')
+    _write(content / 'about.md', 'About')
+    _write(content / 'blog' / 'first.md', 'Python Tips')
+    _write(content / 'blog' / 'second.md', 'Second Post')
+    _write(content / 'blog' / 'proj.page' / 'page.md', 'Project')
+    return content
+
+
+def _index_state(data_dir):
+    """(content index rows, search index documents) without timestamps"""
+    pages = sorted(
+        (page['url'], page['source_file'], page['title'])
+        for page in ContentIndex(data_dir).get_all_pages()
+    )
+    with SearchIndex(data_dir)._ensure_index().searcher() as searcher:
+        documents = sorted(
+            (doc['url'], doc['source_file'], doc['title'], doc['garden'])
+            for doc in searcher.all_stored_fields()
+        )
+    return pages, documents
+
+
+def _full_rebuild(content_dir, data_dir):
+    index_mgr = IndexManager(content_dir, data_dir, deferred=True)
+    index_mgr.set_dirty_flag()
+    return index_mgr.rebuild_if_dirty()
+
+
+def test_manifest_replay_matches_full_rebuild(garden_dir, tmp_path):
+    data_dir = tmp_path / 'data'
+    _full_rebuild(garden_dir, data_dir)
+
+    # Edits as the editor routes record them: paths relative to
+    # GARDEN_DIR, with the first path component as the garden slug
+    _write(garden_dir / 'blog' / 'second.md', 'Second Post, Revised')
+    (garden_dir / 'blog' / 'first.md').unlink()
+    _write(garden_dir / 'blog' / 'sub' / 'third.md', 'Third')
+    _write(garden_dir / 'blog' / 'proj.page' / 'page.md', 'Project, Revised')
+    _write(garden_dir / 'notes.page' / 'page.md', 'Notes')
+
+    index_mgr = IndexManager(garden_dir, data_dir, deferred=True)
+    index_mgr.update_file('blog/second.md', 'blog')
+    index_mgr.remove_file('blog/first.md', 'blog')
+    index_mgr.update_file('blog/sub/third.md', 'blog')
+    index_mgr.update_file('blog/proj.page/page.md', 'blog')
+    index_mgr.update_file('notes.page/page.md', 'notes.page')
+
+    result = index_mgr.rebuild_if_dirty()
+    assert result['rebuilt']
+    assert not index_mgr.dirty_flag_path.exists()
+
+    pages, documents = _index_state(data_dir)
+    urls = [page[0] for page in pages]
+    assert '/garden/blog/first' not in urls
+    assert '/garden/blog/second' in urls
+    assert not any(url.startswith('/garden/blog/blog/') for url in urls)
+
+    # The same tree indexed from scratch gives the same indexes
+    fresh_dir = tmp_path / 'fresh'
+    _full_rebuild(garden_dir, fresh_dir)
+    assert (pages, documents) == _index_state(fresh_dir)
+
+
+def test_manifest_replay_removes_page_directory(garden_dir, tmp_path):
+    data_dir = tmp_path / 'data'
+    _full_rebuild(garden_dir, data_dir)
+
+    shutil.rmtree(garden_dir / 'blog' / 'proj.page')
+
+    index_mgr = IndexManager(garden_dir, data_dir, deferred=True)
+    index_mgr.remove_file('blog/proj.page', 'blog')
+    index_mgr.rebuild_if_dirty()
+
+    pages, documents = _index_state(data_dir)
+    assert '/garden/blog/proj' not in [page[0] for page in pages]
+    assert '/garden/blog/proj' not in [doc[0] for doc in documents]
+
+
+def test_manifest_replay_indexes_page_subpages(garden_dir, tmp_path):
+    data_dir = tmp_path / 'data'
+    _full_rebuild(garden_dir, data_dir)
+
+    _write(garden_dir / 'blog' / 'proj.page' / 'notes.md', 'Project Notes')
+    (garden_dir / 'blog' / 'proj.page' / 'diagram.png').write_bytes(b'png')
+
+    index_mgr = IndexManager(garden_dir, data_dir, deferred=True)
+    index_mgr.update_file('blog/proj.page/notes.md', 'blog')
+    index_mgr.update_file('blog/proj.page/diagram.png', 'blog')
+    # The asset is in the manifest but not counted
+    assert index_mgr.rebuild_if_dirty()['count'] == 1
+
+    pages, documents = _index_state(data_dir)
+    fresh_dir = tmp_path / 'fresh'
+    _full_rebuild(garden_dir, fresh_dir)
+    assert (pages, documents) == _index_state(fresh_dir)
+    assert ('/garden/blog/proj/notes', 'blog/proj.page/notes.md', 'Project Notes') in pages
+
+    (garden_dir / 'blog' / 'proj.page' / 'notes.md').unlink()
+    index_mgr.remove_file('blog/proj.page/notes.md', 'blog')
+    index_mgr.rebuild_if_dirty()
+    pages, documents = _index_state(data_dir)
+    assert '/garden/blog/proj/notes' not in [page[0] for page in pages]
+    assert '/garden/blog/proj/notes' not in [doc[0] for doc in documents]
@@ -0,0 +1,40 @@
+"""
+Tests for MarkdownHandler parsing
+"""
+from trellis.utils.markdown_handler import MarkdownHandler
+
+
+def test_metadata_only_parse_returns_copies(tmp_path):
+    path = tmp_path / 'post.md'
+    path.write_text('---\ntitle: Post\ntags: [a]\n---\nBody text.\n', encoding='utf-8')
+    handler = MarkdownHandler(tmp_path)
+
+    first = handler.parse_file('post.md', metadata_only=True)
+    first['metadata']['title'] = 'Changed'
+    first['metadata']['tags'].append('b')
+
+    second = MarkdownHandler(tmp_path).parse_file('post.md', metadata_only=True)
+    assert second['metadata'] == {'title': 'Post', 'tags': ['a']}
+    assert second['excerpt'] == 'Body text.'
+
+
+def test_metadata_only_parse_sees_edits(tmp_path):
+    path = tmp_path / 'post.md'
+    path.write_text('---\ntitle: Before\n---\nBody.\n', encoding='utf-8')
+    handler = MarkdownHandler(tmp_path)
+    assert handler.parse_file('post.md', metadata_only=True)['metadata']['title'] == 'Before'
+
+    path.write_text('---\ntitle: After, longer\n---\nBody.\n', encoding='utf-8')
+    assert handler.parse_file('post.md', metadata_only=True)['metadata']['title'] == 'After, longer'
+
+
+def test_dashes_without_frontmatter_fence_are_body(tmp_path):
+    # Starts with '---' but not a fence line; the later rules must not be
+    # read as a frontmatter block
+    text = '--- draft notes\n\nIntro\n\n---\n\nkey: value\n\n---\n\nMore\n'
+    (tmp_path / 'draft.md').write_text(text, encoding='utf-8')
+    handler = MarkdownHandler(tmp_path)
+
+    for kwargs in ({}, {'metadata_only': True}, {'for_index': True}):
+        assert handler.parse_file('draft.md', **kwargs)['metadata'] == {}
+    assert handler.parse_file('draft.md', for_index=True)['raw_content'] == text.rstrip('\n')
@@ -54,6 +54,12 @@ def create_app(config_class=None):
     else:
         app = Flask(__name__)
 
+    # Reuse compiled template bytecode across workers and restarts. Must be
+    # set before anything touches app.jinja_env. Template source is only
+    # re-checked when TEMPLATES_AUTO_RELOAD/DEBUG is on.
+    from jinja2 import FileSystemBytecodeCache
+    app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache()}
+
     app.config.from_object(config_class)
 
     # Initialize Trellis (sets CONTENT_DIR/GARDEN_DIR, creates garden dir)
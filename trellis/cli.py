@@ -62,7 +62,7 @@ def _index_directory(content_index, base_content_dir, current_dir, garden_slug,
 
         try:
             if item.is_file() and item.suffix == '.md':
-                article = handler.parse_file(item.name)
+                article = handler.parse_file(item.name, metadata_only=True)
                 slug = handler.generate_slug(item.name)
                 url = f"/garden/{garden_slug}/{url_prefix}{slug}" if url_prefix else f"/garden/{garden_slug}/{slug}"
                 source_file = str(item.relative_to(base_content_dir))
@@ -79,7 +79,7 @@ def _index_directory(content_index, base_content_dir, current_dir, garden_slug,
             elif item.is_dir() and item.suffix == '.page':
                 page_md = item / 'page.md'
                 if page_md.exists():
-                    article = handler.parse_file(item.name)
+                    article = handler.parse_file(item.name, metadata_only=True)
                     slug = handler.generate_slug(item.name)
                     url = f"/garden/{garden_slug}/{url_prefix}{slug}" if url_prefix else f"/garden/{garden_slug}/{slug}"
                     source_file = str(item.relative_to(base_content_dir))
@@ -126,18 +126,19 @@ def _index_all_content(data_dir, content_dir, clear=False):
 
     total_indexed = 0
 
-    for garden_dir in sorted(content_path.iterdir()):
-        if garden_dir.is_dir() and not garden_dir.name.startswith('.'):
-            print(f"Garden: {garden_dir.name}")
-            indexed = _index_directory(
-                content_index,
-                content_path,
-                garden_dir,
-                garden_dir.name
-            )
-            total_indexed += indexed
-            print(f"  Subtotal: {indexed} pages")
-            print()
+    with content_index.transaction():
+        for garden_dir in sorted(content_path.iterdir()):
+            if garden_dir.is_dir() and not garden_dir.name.startswith('.'):
+                print(f"Garden: {garden_dir.name}")
+                indexed = _index_directory(
+                    content_index,
+                    content_path,
+                    garden_dir,
+                    garden_dir.name
+                )
+                total_indexed += indexed
+                print(f"  Subtotal: {indexed} pages")
+                print()
 
     print(f"Total indexed: {total_indexed} pages")
     return total_indexed
@@ -10,9 +10,20 @@ Stored in trellis_content.db alongside trellis_admin.db
 """
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+# SQLite's LOWER() and LIKE only fold ASCII letters; match that exactly
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+# In-memory lookup tables for link resolution, shared by every
+# ContentIndex in the process (handlers create one per request):
+# str(db_path) -> ((mtime_ns, size), tables). See _get_lookups().
+_LOOKUP_CACHE = {}
+_LOOKUP_CACHE_LOCK = threading.Lock()
+
 
 class ContentIndex:
     """Manages the content index database (trellis_content.db)"""
@@ -25,13 +36,14 @@ class ContentIndex:
         """
         self.data_dir = Path(data_dir)
         self.db_path = self.data_dir / 'trellis_content.db'
+        self._batch_conn = None
         self._ensure_db()
 
     def _ensure_db(self):
         """Create database and tables if they don't exist"""
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS pages (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -48,12 +60,54 @@ class ContentIndex:
             conn.execute('CREATE INDEX IF NOT EXISTS idx_updated_date ON pages(updated_date DESC)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_source_file ON pages(source_file)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_title ON pages(title COLLATE NOCASE)')
-            conn.commit()
 
     def _get_connection(self):
         """Get database connection"""
         return sqlite3.connect(str(self.db_path))
 
+    @contextmanager
+    def _connect(self):
+        """Yield a connection for one operation
+
+        Inside transaction() this is the shared batch connection and
+        nothing is committed here; otherwise a new connection is opened,
+        committed on success and closed.
+        """
+        if self._batch_conn is not None:
+            yield self._batch_conn
+            return
+
+        conn = self._get_connection()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Group many writes into a single SQLite transaction
+
+        Used by bulk rebuilds so N upserts cost one commit (and fsync)
+        instead of N. Rolled back if the block raises.
+        """
+        if self._batch_conn is not None:
+            yield self
+            return
+
+        conn = self._get_connection()
+        conn.execute('BEGIN IMMEDIATE')
+        self._batch_conn = conn
+        try:
+            yield self
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._batch_conn = None
+            conn.close()
+
     def _normalize_date(self, date_value):
         """Convert date to string format YYYY-MM-DD
 
@@ -118,7 +172,7 @@ class ContentIndex:
 
         effective_updated = self._get_effective_updated_date(metadata, full_source_path)
 
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             conn.execute('''
                 INSERT INTO pages (url, source_file, title, description,
                                    created_date, published_date, updated_date, last_indexed)
@@ -140,19 +194,19 @@ class ContentIndex:
                 self._normalize_date(metadata.get('published_date')),
                 effective_updated
             ))
-            conn.commit()
+        self._drop_lookups()
 
     def delete_page(self, url):
         """Remove a page from the index"""
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             conn.execute('DELETE FROM pages WHERE url = ?', (url,))
-            conn.commit()
+        self._drop_lookups()
 
     def delete_by_source(self, source_file):
         """Remove a page by source file path"""
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             conn.execute('DELETE FROM pages WHERE source_file = ?', (source_file,))
-            conn.commit()
+        self._drop_lookups()
 
     def get_recent_pages(self, limit=10):
         """Get recently updated pages
@@ -163,7 +217,7 @@ class ContentIndex:
         Returns:
             List of dictionaries with page info
         """
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT url, source_file, title, description,
@@ -177,7 +231,7 @@ class ContentIndex:
 
     def get_all_pages(self):
         """Get all indexed pages"""
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT url, source_file, title, description,
@@ -189,15 +243,15 @@ class ContentIndex:
 
     def get_page_count(self):
         """Get total number of indexed pages"""
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             cursor = conn.execute('SELECT COUNT(*) FROM pages')
             return cursor.fetchone()[0]
 
     def clear_index(self):
         """Clear all entries from the index"""
-        with self._get_connection() as conn:
+        with self._connect() as conn:
             conn.execute('DELETE FROM pages')
-            conn.commit()
+        self._drop_lookups()
 
     def find_page_by_title(self, title):
         """Find a page by exact title match (case-insensitive)
@@ -208,16 +262,104 @@ class ContentIndex:
         Returns:
             Dictionary with page info or None if not found
         """
-        with self._get_connection() as conn:
+        page = self._get_lookups()['by_title'].get(title.translate(_ASCII_LOWER))
+        return dict(page) if page else None
+
+    def find_pages_by_titles(self, titles):
+        """Find pages for many exact titles at once (case-insensitive)
+
+        Same matching as find_page_by_title.
+
+        Args:
+            titles: Iterable of page titles to search for
+
+        Returns:
+            Dictionary mapping each found title (as given) to its page info
+        """
+        by_title = self._get_lookups()['by_title']
+        found = {}
+        for title in titles:
+            page = by_title.get(title.translate(_ASCII_LOWER))
+            if page:
+                found[title] = dict(page)
+        return found
+
+    def _get_lookups(self):
+        """Return the lookup tables for this database, shared process-wide
+
+        They are reloaded when the database file changes (mtime or size).
+
+        The tables mirror the SQL matching rules: titles and URL suffixes
+        are ASCII-lowercased like SQLite's LOWER() and LIKE.
+
+        Returns:
+            Dictionary with:
+            - by_title: normalized title -> first page (by id) with it
+            - by_url: url -> page
+            - by_suffix: normalized text after any '/' in a url -> page
+              with the shortest such url
+            - fuzzy: (normalized_titles, pages) ordered like the fuzzy
+              query (shortest title first, then by title)
+        """
+        key = str(self.db_path)
+        try:
+            st = os.stat(self.db_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+
+        with _LOOKUP_CACHE_LOCK:
+            cached = _LOOKUP_CACHE.get(key)
+        if cached is not None and stamp is not None and cached[0] == stamp:
+            return cached[1]
+
+        lookups = self._load_lookups()
+        # Uncommitted rows seen inside transaction() must not outlive it
+        if self._batch_conn is None and stamp is not None:
+            with _LOOKUP_CACHE_LOCK:
+                _LOOKUP_CACHE[key] = (stamp, lookups)
+        return lookups
+
+    def _drop_lookups(self):
+        """Forget the lookup tables after a write through this instance"""
+        with _LOOKUP_CACHE_LOCK:
+            _LOOKUP_CACHE.pop(str(self.db_path), None)
+
+    def _load_lookups(self):
+        """Build the tables returned by _get_lookups() from the database"""
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT url, source_file, title, description
                 FROM pages
-                WHERE LOWER(title) = LOWER(?)
-                LIMIT 1
-            ''', (title,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+                ORDER BY id
+            ''')
+            pages = [dict(row) for row in cursor.fetchall()]
+
+        by_title = {}
+        by_url = {}
+        by_suffix = {}
+        for page in pages:
+            url = page['url']
+            by_url[url] = page
+            if page['title'] is not None:
+                by_title.setdefault(page['title'].translate(_ASCII_LOWER), page)
+        # Shortest url first so setdefault keeps the LENGTH(url) winner
+        for page in sorted(pages, key=lambda p: len(p['url'])):
+            url = page['url'].translate(_ASCII_LOWER)
+            pos = url.find('/')
+            while pos != -1:
+                by_suffix.setdefault(url[pos + 1:], page)
+                pos = url.find('/', pos + 1)
+
+        titled = sorted((p for p in pages if p['title'] is not None),
+                        key=lambda p: (len(p['title']), p['title']))
+        return {
+            'by_title': by_title,
+            'by_url': by_url,
+            'by_suffix': by_suffix,
+            'fuzzy': ([p['title'].translate(_ASCII_LOWER) for p in titled], titled),
+        }
 
     def find_pages_by_title_fuzzy(self, title, limit=5):
         """Find pages with titles similar to the search term
@@ -229,7 +371,19 @@ class ContentIndex:
         Returns:
             List of page dictionaries, ordered by relevance
         """
-        with self._get_connection() as conn:
+        # LIKE wildcards in the term need SQLite's own matching
+        if '%' not in title and '_' not in title:
+            needle = title.translate(_ASCII_LOWER)
+            norm_titles, pages = self._get_lookups()['fuzzy']
+            matches = []
+            for norm, page in zip(norm_titles, pages):
+                if needle in norm:
+                    if len(matches) == limit:
+                        break
+                    matches.append(dict(page))
+            return matches
+
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT url, source_file, title, description
@@ -254,33 +408,20 @@ class ContentIndex:
         Returns:
             Dictionary with page info or None if not found
         """
-        with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
+        lookups = self._get_lookups()
 
-            # Try exact URL match first
-            cursor = conn.execute('''
-                SELECT url, source_file, title, description
-                FROM pages
-                WHERE url = ?
-                LIMIT 1
-            ''', (slug if slug.startswith('/') else f'/{slug}',))
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
+        # Try exact URL match first
+        page = lookups['by_url'].get(slug if slug.startswith('/') else f'/{slug}')
+        if page:
+            return dict(page)
 
-            # Try URL ending with slug
-            cursor = conn.execute('''
-                SELECT url, source_file, title, description
-                FROM pages
-                WHERE url LIKE ?
-                ORDER BY LENGTH(url)
-                LIMIT 1
-            ''', (f'%/{slug}',))
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
+        # Try URL ending with slug; LIKE wildcards need SQLite's own matching
+        if '%' not in slug and '_' not in slug:
+            page = lookups['by_suffix'].get(slug.translate(_ASCII_LOWER))
+            return dict(page) if page else None
 
-            # Try as garden/slug pattern
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
             cursor = conn.execute('''
                 SELECT url, source_file, title, description
                 FROM pages
@@ -3,13 +3,16 @@ from flask_login import login_required, current_user, login_user, logout_user
 from trellis.models import User
 from trellis.models.content_index import ContentIndex
 from trellis.utils.markdown_handler import MarkdownHandler
-from trellis.utils.git_handler import GitHandler
-from trellis.utils.garden_manager import GardenManager
+from trellis.utils.git_handler import GitBatcher
+from trellis.utils.garden_manager import GardenManager, format_new_config
 from trellis.utils.search_index import SearchIndex
 from flask import current_app
 from werkzeug.utils import secure_filename
-from functools import wraps
+from functools import wraps, lru_cache
+import json
 import os
+import re
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -17,6 +20,29 @@ main_bp = Blueprint('main', __name__)
 editor_bp = Blueprint('editor', __name__, url_prefix='/editor')
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+# Slug sanitization: spaces/underscores become hyphens, anything else
+# that is not a (Unicode) letter, digit or hyphen is dropped. With '_'
+# already translated, \w is exactly str.isalnum() here.
+_SLUG_TRANS = str.maketrans({' ': '-', '_': '-'})
+_SLUG_STRIP = re.compile(r'[^\w-]+')
+
+# File types the editor can open, and the editor mode used for each
+EDITABLE_EXTENSIONS = frozenset({
+    '.md', '.yaml', '.yml', '.py', '.js', '.css', '.html', '.txt', '.json', '.sh', '.xml'
+})
+EDITOR_MODE_BY_EXT = {
+    '.md': 'markdown',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.py': 'python',
+    '.js': 'javascript',
+    '.json': 'json',
+    '.html': 'html',
+    '.css': 'css',
+    '.xml': 'xml',
+    '.sh': 'shell',
+}
+
 
 @main_bp.app_context_processor
 def inject_site_config():
@@ -38,6 +64,64 @@ def _can_view_drafts():
     """Check if the current user can view draft content"""
     return current_user.is_authenticated and current_user.is_editor()
 
+def _render_error(template, error, code=400, **context):
+    """Re-render a form template with a validation error message"""
+    return render_template(template, error=error, **context), code
+
+def _slugify(name):
+    """Convert a user-supplied name into a directory slug"""
+    return _SLUG_STRIP.sub('', name.lower().translate(_SLUG_TRANS))
+
+def _write_file(path, content, exclusive=False):
+    """Write text content as UTF-8 with a single open/write/close
+
+    With exclusive=True the file must not already exist (O_EXCL), so
+    concurrent creates of the same path cannot both succeed; the loser
+    gets FileExistsError. Otherwise the file is created or truncated.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if exclusive else os.O_TRUNC)
+    data = memoryview(content.encode('utf-8'))
+    # 0o666 like open(), so the umask decides (e.g. 0664 under umask 002)
+    fd = os.open(str(path), flags, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+# ============================================================================
+# Listing Caches
+# ============================================================================
+
+# Cached listings are reused for at most this many seconds. Edits made
+# outside this process (git pull, the CLI, a shell) to existing or nested
+# files do not change a directory's mtime, so the key also carries a
+# time bucket that rolls over every LISTING_CACHE_TTL seconds.
+LISTING_CACHE_TTL = 10
+
+def _listing_cache_bucket():
+    """Current time bucket for the listing cache keys"""
+    return int(time.monotonic() // LISTING_CACHE_TTL)
+
+@lru_cache(maxsize=256)
+def _gardens_cache(garden_dir, mtime_ns, bucket):
+    """Gardens under garden_dir; mtime_ns (of garden_dir) and the time bucket are part of the key"""
+    return GardenManager(garden_dir).get_gardens()
+
+@lru_cache(maxsize=256)
+def _list_articles_cache(garden_path, mtime_ns, data_dir, bucket):
+    """Articles in a garden; mtime_ns (of garden_path) and the time bucket are part of the key"""
+    return MarkdownHandler(garden_path, data_dir).list_articles()
+
+def _invalidate_listing_caches():
+    """Drop cached listings after the editor changes content
+
+    Directory mtimes only change when a direct child is added or removed,
+    so edits to existing or nested files must clear the caches explicitly.
+    """
+    _gardens_cache.cache_clear()
+    _list_articles_cache.cache_clear()
+
 # ============================================================================
 # Decorators
 # ============================================================================
@@ -103,6 +187,9 @@ def root_page(page_path):
     if _is_draft(article) and not _can_view_drafts():
         return "Page not found", 404
 
+    # Listings only carry metadata; render the page we're showing
+    article.update(handler.parse_file(article['filename']))
+
     garden_manager = GardenManager(current_app.config['GARDEN_DIR'])
     all_gardens = garden_manager.get_gardens()
 
@@ -240,6 +327,9 @@ def article(garden_slug, article_path):
     if _is_draft(article) and not _can_view_drafts():
         return "Article not found", 404
 
+    # Listings only carry metadata; render the article we're showing
+    article.update(handler.parse_file(article['filename']))
+
     # Build breadcrumbs
     breadcrumbs = garden_manager.get_breadcrumbs(garden_slug, article_path)
 
@@ -381,22 +471,22 @@ def register():
 
         # Validation
         if not username or not email_address or not password:
-            return render_template('register.html', error="All fields are required", form=form_data)
+            return _render_error('register.html', "All fields are required", form=form_data)
 
         if password != password_confirm:
-            return render_template('register.html', error="Passwords do not match", form=form_data)
+            return _render_error('register.html', "Passwords do not match", form=form_data)
 
         if len(password) < 6:
-            return render_template('register.html', error="Password must be at least 6 characters", form=form_data)
+            return _render_error('register.html', "Password must be at least 6 characters", form=form_data)
 
         if not User.validate_email(email_address):
-            return render_template('register.html', error="Invalid email address", form=form_data)
+            return _render_error('register.html', "Invalid email address", form=form_data)
 
         if User.get_by_username(username):
-            return render_template('register.html', error="Username already exists", form=form_data)
+            return _render_error('register.html', "Username already exists", form=form_data)
 
         if User.get_by_email(email_address):
-            return render_template('register.html', error="Email already registered", form=form_data)
+            return _render_error('register.html', "Email already registered", form=form_data)
 
         # Create reader account
         new_user = User(username=username, email_address=email_address, role='reader')
@@ -429,13 +519,13 @@ def change_password():
         confirm_password = request.form.get('confirm_password')
 
         if not current_user.check_password(current_password):
-            return render_template('change_password.html', error="Current password is incorrect")
+            return _render_error('change_password.html', "Current password is incorrect")
 
         if new_password != confirm_password:
-            return render_template('change_password.html', error="New passwords do not match")
+            return _render_error('change_password.html', "New passwords do not match")
 
         if len(new_password) < 6:
-            return render_template('change_password.html', error="Password must be at least 6 characters")
+            return _render_error('change_password.html', "Password must be at least 6 characters")
 
         current_user.set_password(new_password)
         from trellis.models import db
@@ -472,19 +562,19 @@ def add_user():
 
         # Validation
         if not username or not password or not email_address:
-            return render_template('add_user.html', error="Username, email, and password are required")
+            return _render_error('add_user.html', "Username, email, and password are required")
 
         if not User.validate_email(email_address):
-            return render_template('add_user.html', error="Invalid email address")
+            return _render_error('add_user.html', "Invalid email address")
 
         if User.get_by_username(username):
-            return render_template('add_user.html', error="Username already exists")
+            return _render_error('add_user.html', "Username already exists")
 
         if User.get_by_email(email_address):
-            return render_template('add_user.html', error="Email already exists")
+            return _render_error('add_user.html', "Email already exists")
 
         if len(password) < 6:
-            return render_template('add_user.html', error="Password must be at least 6 characters")
+            return _render_error('add_user.html', "Password must be at least 6 characters")
 
         if role not in ['admin', 'editor', 'reader']:
             role = 'reader'
@@ -507,7 +597,9 @@ def edit_user(user_id):
     if not current_user.is_admin():
         return "Access denied", 403
 
-    user = User.get(user_id)
+    from trellis.models import db
+    # Identity-map lookup: no query if the user is already in the session
+    user = db.session.get(User, user_id)
     if not user:
         return "User not found", 404
 
@@ -522,11 +614,11 @@ def edit_user(user_id):
         if email_address:
             # Validate email format
             if not User.validate_email(email_address):
-                return render_template('edit_user.html', user=user, error="Invalid email address")
+                return _render_error('edit_user.html', "Invalid email address", user=user)
             # Check for duplicate email (excluding current user)
             existing = User.get_by_email(email_address)
             if existing and existing.id != user.id:
-                return render_template('edit_user.html', user=user, error="Email already exists")
+                return _render_error('edit_user.html', "Email already exists", user=user)
             user.email_address = email_address
         else:
             # Allow clearing email address
@@ -542,11 +634,12 @@ def edit_user(user_id):
 
         if new_password:
             if len(new_password) < 6:
-                return render_template('edit_user.html', user=user, error="Password must be at least 6 characters")
+                return _render_error('edit_user.html', "Password must be at least 6 characters", user=user)
             user.set_password(new_password)
 
-        from trellis.models import db
-        db.session.commit()
+        # Skip the UPDATE round-trip when the form resubmitted the same values
+        if db.session.is_modified(user):
+            db.session.commit()
 
         return redirect(url_for('auth.list_users'))
 
@@ -580,15 +673,16 @@ def delete_user(user_id):
 @editor_required
 def dashboard():
     """Show all gardens and their articles"""
-    garden_manager = GardenManager(current_app.config['GARDEN_DIR'])
-    gardens = garden_manager.get_gardens()
+    garden_dir = current_app.config['GARDEN_DIR']
+    data_dir = current_app.config.get('DATA_DIR')
+    bucket = _listing_cache_bucket()
+    gardens = _gardens_cache(garden_dir, os.stat(garden_dir).st_mtime_ns, bucket)
 
     # Get articles for each garden
     gardens_with_articles = []
     for garden in gardens:
-        garden_path = Path(current_app.config['GARDEN_DIR']) / garden['slug']
-        handler = MarkdownHandler(garden_path, current_app.config.get('DATA_DIR'))
-        articles = handler.list_articles()
+        garden_path = os.path.join(garden_dir, garden['slug'])
+        articles = _list_articles_cache(garden_path, os.stat(garden_path).st_mtime_ns, data_dir, bucket)
         gardens_with_articles.append({
             'garden': garden,
             'articles': articles
@@ -628,33 +722,36 @@ def browse(dir_path=''):
     complex_pages = []  # .page directories
     basic_content = []  # Files (.md, .yaml, etc.)
 
-    # Define editable extensions
-    editable_extensions = {'.md', '.yaml', '.yml', '.py', '.js', '.css', '.html', '.txt', '.json', '.sh', '.xml'}
-
     try:
-        for item in sorted(current_dir.iterdir()):
+        # scandir caches the type from readdir, so is_dir() needs no stat
+        with os.scandir(current_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+
+        for entry in entries:
+            name = entry.name
             # Skip hidden files and __pycache__
-            if item.name.startswith('.') or item.name == '__pycache__':
+            if name.startswith('.') or name == '__pycache__':
                 continue
 
-            if item.is_dir():
-                if item.suffix == '.page':
+            item_path = str(Path(dir_path) / name) if dir_path else name
+            suffix = os.path.splitext(name)[1]
+
+            if entry.is_dir():
+                if suffix == '.page':
                     # Complex page directory
-                    page_md = item / 'page.md'
-                    has_page_md = page_md.exists()
                     complex_pages.append({
-                        'name': item.stem,  # Remove .page extension
-                        'full_name': item.name,
-                        'path': str(Path(dir_path) / item.name) if dir_path else item.name,
-                        'has_page_md': has_page_md
+                        'name': name[:-len(suffix)],  # Remove .page extension
+                        'full_name': name,
+                        'path': item_path,
+                        'has_page_md': os.path.exists(os.path.join(entry.path, 'page.md'))
                     })
                 else:
                     # Regular directory (garden or subdirectory)
-                    config_path = item / 'config.yaml'
-                    has_config = config_path.exists()
+                    config_path = os.path.join(entry.path, 'config.yaml')
+                    has_config = os.path.exists(config_path)
 
                     # Try to read title from config
-                    title = item.name.replace('-', ' ').replace('_', ' ').title()
+                    title = name.replace('-', ' ').replace('_', ' ').title()
                     if has_config:
                         try:
                             import yaml
@@ -665,22 +762,22 @@ def browse(dir_path=''):
                             pass
 
                     gardens.append({
-                        'name': item.name,
+                        'name': name,
                         'title': title,
-                        'path': str(Path(dir_path) / item.name) if dir_path else item.name,
+                        'path': item_path,
                         'has_config': has_config
                     })
             else:
                 # File
-                is_editable = item.suffix in editable_extensions
-                file_type = item.suffix[1:] if item.suffix else 'file'
+                is_editable = suffix in EDITABLE_EXTENSIONS
+                file_type = suffix[1:] or 'file'
 
                 basic_content.append({
-                    'name': item.name,
-                    'path': str(Path(dir_path) / item.name) if dir_path else item.name,
+                    'name': name,
+                    'path': item_path,
                     'is_editable': is_editable,
                     'file_type': file_type,
-                    'size': item.stat().st_size
+                    'size': entry.stat().st_size
                 })
 
     except Exception as e:
@@ -697,7 +794,6 @@ def browse(dir_path=''):
 @editor_required
 def create_garden():
     """Create a new garden (directory with config.yaml)"""
-    import yaml
     name = request.json.get('name', '').strip()
     parent_path = request.json.get('parent_path', '')
 
@@ -705,42 +801,37 @@ def create_garden():
         return jsonify({'error': 'Name is required'}), 400
 
     # Sanitize name (convert to slug)
-    slug = name.lower().replace(' ', '-').replace('_', '-')
-    slug = ''.join(c for c in slug if c.isalnum() or c == '-')
+    slug = _slugify(name)
+    if not slug:
+        return jsonify({'error': 'Name must contain letters or digits'}), 400
 
     content_dir = Path(current_app.config['GARDEN_DIR'])
     parent_dir = content_dir / parent_path if parent_path else content_dir
     new_dir = parent_dir / slug
 
-    if new_dir.exists():
-        return jsonify({'error': f'Directory "{slug}" already exists'}), 400
-
     try:
-        # Create directory
-        new_dir.mkdir(parents=True, exist_ok=True)
+        # Create directory (fails if it already exists)
+        new_dir.mkdir(parents=True)
 
         # Create config.yaml
-        config = {
-            'title': name,
-            'description': '',
-            'created_date': datetime.now().strftime('%Y-%m-%d'),
-            'order': 999
-        }
+        today = datetime.now().strftime('%Y-%m-%d')
         config_path = new_dir / 'config.yaml'
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        _write_file(config_path, format_new_config(name, today), exclusive=True)
 
+    except FileExistsError:
+        return jsonify({'error': f'Directory "{slug}" already exists'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
     # Post-creation work (non-fatal)
     try:
-        from trellis.utils.git_handler import GitHandler
-        git = GitHandler(current_app.config.get('GITLAB_REPO_PATH', '.'))
-        git.auto_commit(str(config_path), f"Created garden: {slug}")
+        git = GitBatcher.get(current_app.config.get('GITLAB_REPO_PATH', '.'))
+        git.enqueue(str(config_path), f"Created garden: {slug}")
     except Exception as e:
         print(f"Git commit failed for new garden {slug}: {e}")
 
+    _invalidate_listing_caches()
+
     new_path = str(Path(parent_path) / slug) if parent_path else slug
     return jsonify({'success': True, 'path': new_path})
 
@@ -756,19 +847,17 @@ def create_page():
         return jsonify({'error': 'Name is required'}), 400
 
     # Sanitize name
-    slug = name.lower().replace(' ', '-').replace('_', '-')
-    slug = ''.join(c for c in slug if c.isalnum() or c == '-')
+    slug = _slugify(name)
+    if not slug:
+        return jsonify({'error': 'Name must contain letters or digits'}), 400
 
     content_dir = Path(current_app.config['GARDEN_DIR'])
     parent_dir = content_dir / parent_path if parent_path else content_dir
     new_dir = parent_dir / f"{slug}.page"
 
-    if new_dir.exists():
-        return jsonify({'error': f'Page "{slug}" already exists'}), 400
-
     try:
-        # Create .page directory
-        new_dir.mkdir(parents=True, exist_ok=True)
+        # Create .page directory (fails if it already exists)
+        new_dir.mkdir(parents=True)
 
         # Create page.md with frontmatter
         metadata = {
@@ -780,9 +869,10 @@ def create_page():
         post = frontmatter.Post('# ' + name + '\n\nYour content here.', **metadata)
 
         page_md = new_dir / 'page.md'
-        with open(page_md, 'w') as f:
-            f.write(frontmatter.dumps(post))
+        _write_file(page_md, frontmatter.dumps(post), exclusive=True)
 
+    except FileExistsError:
+        return jsonify({'error': f'Page "{slug}" already exists'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -790,9 +880,8 @@ def create_page():
 
     # Post-creation work (non-fatal)
     try:
-        from trellis.utils.git_handler import GitHandler
-        git = GitHandler(current_app.config.get('GITLAB_REPO_PATH', '.'))
-        git.auto_commit(str(page_md), f"Created page: {slug}")
+        git = GitBatcher.get(current_app.config.get('GITLAB_REPO_PATH', '.'))
+        git.enqueue(str(page_md), f"Created page: {slug}")
     except Exception as e:
         print(f"Git commit failed for new page {slug}: {e}")
 
@@ -809,6 +898,8 @@ def create_page():
     except Exception as e:
         print(f"Index update failed for new page {slug}: {e}")
 
+    _invalidate_listing_caches()
+
     return jsonify({'success': True, 'path': new_path})
 
 @editor_bp.route('/create/file', methods=['POST'])
@@ -834,9 +925,6 @@ def create_file():
     parent_dir = content_dir / parent_path if parent_path else content_dir
     new_file = parent_dir / filename
 
-    if new_file.exists():
-        return jsonify({'error': f'File "{filename}" already exists'}), 400
-
     try:
         # Create file with appropriate content
         if extension == '.md':
@@ -859,8 +947,10 @@ def create_file():
             # Generic text file
             content = f"# {name}\n# Created: {datetime.now().strftime('%Y-%m-%d')}\n\n"
 
-        new_file.write_text(content)
+        _write_file(new_file, content, exclusive=True)
 
+    except FileExistsError:
+        return jsonify({'error': f'File "{filename}" already exists'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -868,9 +958,8 @@ def create_file():
 
     # Post-creation work (non-fatal)
     try:
-        from trellis.utils.git_handler import GitHandler
-        git = GitHandler(current_app.config.get('GITLAB_REPO_PATH', '.'))
-        git.auto_commit(str(new_file), f"Created file: {filename}")
+        git = GitBatcher.get(current_app.config.get('GITLAB_REPO_PATH', '.'))
+        git.enqueue(str(new_file), f"Created file: {filename}")
     except Exception as e:
         print(f"Git commit failed for new file {filename}: {e}")
 
@@ -888,6 +977,8 @@ def create_file():
         except Exception as e:
             print(f"Index update failed for new file {filename}: {e}")
 
+    _invalidate_listing_caches()
+
     return jsonify({'success': True, 'path': new_path})
 
 @editor_bp.route('/edit-file/<path:file_path>')
@@ -920,18 +1011,7 @@ def edit_file(file_path):
 
     # Determine file type and editor mode
     extension = full_path.suffix
-    editor_mode = {
-        '.md': 'markdown',
-        '.yaml': 'yaml',
-        '.yml': 'yaml',
-        '.py': 'python',
-        '.js': 'javascript',
-        '.json': 'json',
-        '.html': 'html',
-        '.css': 'css',
-        '.xml': 'xml',
-        '.sh': 'shell',
-    }.get(extension, 'text')
+    editor_mode = EDITOR_MODE_BY_EXT.get(extension, 'text')
 
     # For markdown, parse frontmatter
     metadata = {}
@@ -990,16 +1070,14 @@ def save_file():
 
     try:
         # Write file
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        _write_file(full_path, content)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
     # Post-save work (non-fatal)
     try:
-        from trellis.utils.git_handler import GitHandler
-        git = GitHandler(current_app.config.get('GITLAB_REPO_PATH', '.'))
-        git.auto_commit(str(full_path), f"Updated: {full_path.name}")
+        git = GitBatcher.get(current_app.config.get('GITLAB_REPO_PATH', '.'))
+        git.enqueue(str(full_path), f"Updated: {full_path.name}")
     except Exception as e:
         print(f"Git commit failed for {full_path.name}: {e}")
 
@@ -1017,5 +1095,7 @@ def save_file():
         except Exception as e:
             print(f"Index update failed for {full_path.name}: {e}")
 
+    _invalidate_listing_caches()
+
     return jsonify({'success': True})
 
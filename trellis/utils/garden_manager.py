@@ -1,7 +1,67 @@
+import functools
 import yaml
 import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+
+@functools.lru_cache(maxsize=256)
+def _load_yaml_cached(path_str, mtime_ns, size):
+    """Parse a YAML file; mtime/size are part of the key so edits evict it"""
+    # Configs are tiny: one read and parsing from a str is cheaper than
+    # letting the loader pull the stream through its reader in chunks
+    with open(path_str, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return yaml.load(text, Loader=SafeLoader) or {}
+
+
+def _load_config(config_path):
+    """Load a config.yaml through the parse cache
+
+    Returns a copy callers may modify, or None if the file doesn't exist.
+    """
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        return None
+    return dict(_load_yaml_cached(str(config_path), st.st_mtime_ns, st.st_size))
+
+
+def format_new_config(title, created_date):
+    """Text of a new garden's config.yaml
+
+    Only the title needs the YAML emitter (quoting, escapes); the other
+    keys are fixed.
+    """
+    title_line = yaml.dump({'title': title}, Dumper=SafeDumper, allow_unicode=True)
+    return f"{title_line}description: ''\ncreated_date: '{created_date}'\norder: 999\n"
+
+
+# Reading configs is I/O-bound, so on slow (network/overlay) filesystems a
+# thread pool overlaps the opens. Small sites read them inline.
+PARALLEL_CONFIG_THRESHOLD = 8
+_config_executor = None
+_config_executor_lock = threading.Lock()
+
+
+def _get_config_executor():
+    """Return the shared config-reading thread pool, creating it on first use"""
+    global _config_executor
+    with _config_executor_lock:
+        if _config_executor is None:
+            _config_executor = ThreadPoolExecutor(max_workers=16,
+                                                  thread_name_prefix='garden-config')
+        return _config_executor
+
+
 class GardenManager:
     def __init__(self, content_dir):
         self.content_dir = Path(content_dir)
@@ -10,18 +70,28 @@ class GardenManager:
         """Get all gardens (subdirectories under content/)"""
         gardens = []
 
-        if not self.content_dir.exists():
+        try:
+            entries = os.scandir(self.content_dir)
+        except FileNotFoundError:
             return gardens
 
-        for item in self.content_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                garden_config = self.get_garden_config(item.name)
-                gardens.append({
-                    'slug': item.name,
-                    'title': garden_config.get('title', item.name.replace('-', ' ').title()),
-                    'description': garden_config.get('description', ''),
-                    'config': garden_config
-                })
+        # DirEntry caches the file type from readdir, so is_dir() is free
+        with entries:
+            slugs = [entry.name for entry in entries
+                     if not entry.name.startswith('.') and entry.is_dir()]
+
+        if len(slugs) >= PARALLEL_CONFIG_THRESHOLD:
+            configs = _get_config_executor().map(self.get_garden_config, slugs)
+        else:
+            configs = map(self.get_garden_config, slugs)
+
+        for slug, garden_config in zip(slugs, configs):
+            gardens.append({
+                'slug': slug,
+                'title': garden_config.get('title', slug.replace('-', ' ').title()),
+                'description': garden_config.get('description', ''),
+                'config': garden_config
+            })
 
         # Sort by title
         gardens.sort(key=lambda x: x['title'])
@@ -31,24 +101,14 @@ class GardenManager:
         """Load config.yaml for a specific garden"""
         config_path = self.content_dir / garden_slug / 'config.yaml'
 
-        # Return default config if file doesn't exist
-        if not config_path.exists():
-            return {
-                'title': garden_slug.replace('-', ' ').title(),
-                'description': '',
-                'created_date': None,
-                'order': 999
-            }
-
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f) or {}
-                # Ensure title exists
-                if 'title' not in config:
-                    config['title'] = garden_slug.replace('-', ' ').title()
-                return config
+            config = _load_config(config_path)
         except Exception as e:
             print(f"Error reading garden config {config_path}: {e}")
+            config = None
+
+        # Return default config if file doesn't exist or can't be read
+        if config is None:
             return {
                 'title': garden_slug.replace('-', ' ').title(),
                 'description': '',
@@ -56,6 +116,11 @@ class GardenManager:
                 'order': 999
             }
 
+        # Ensure title exists
+        if 'title' not in config:
+            config['title'] = garden_slug.replace('-', ' ').title()
+        return config
+
     def create_garden_config(self, garden_slug, title=None, description=''):
         """Create a config.yaml for a garden"""
         garden_path = self.content_dir / garden_slug
@@ -74,7 +139,8 @@ class GardenManager:
         }
 
         with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+            yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True)
+        _load_yaml_cached.cache_clear()
 
         return config
 
@@ -90,16 +156,15 @@ class GardenManager:
         config_path = self.content_dir / directory_name / 'config.yaml'
 
         # If config exists, load it
-        if config_path.exists():
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f) or {}
-                    # Ensure title exists
-                    if 'title' not in config:
-                        config['title'] = directory_name.replace('-', ' ').replace('_', ' ').title()
-                    return config
-            except Exception as e:
-                print(f"Error reading config {config_path}: {e}")
+        try:
+            config = _load_config(config_path)
+            if config is not None:
+                # Ensure title exists
+                if 'title' not in config:
+                    config['title'] = directory_name.replace('-', ' ').replace('_', ' ').title()
+                return config
+        except Exception as e:
+            print(f"Error reading config {config_path}: {e}")
 
         # Create default config
         return self.create_garden_config(directory_name)
@@ -108,23 +173,31 @@ class GardenManager:
         """Ensure all garden directories have config.yaml files"""
         gardens = []
 
-        if not self.content_dir.exists():
+        try:
+            entries = os.scandir(self.content_dir)
+        except FileNotFoundError:
             return gardens
 
-        for item in self.content_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                config_path = item / 'config.yaml'
-                if not config_path.exists():
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.is_dir():
+                    continue
+                if not os.path.exists(os.path.join(entry.path, 'config.yaml')):
                     # Create default config
-                    self.create_garden_config(item.name)
-                gardens.append(item.name)
+                    self.create_garden_config(entry.name)
+                gardens.append(entry.name)
 
         return gardens
 
     def get_garden_or_404(self, garden_slug):
         """Get garden config or return None"""
         garden_path = self.content_dir / garden_slug
-        if not garden_path.exists() or not garden_path.is_dir():
+        # One stat() answers both "exists" and "is a directory"
+        try:
+            st = os.stat(garden_path)
+        except OSError:
+            return None
+        if not stat.S_ISDIR(st.st_mode):
             return None
 
         return {
@@ -144,10 +217,14 @@ class GardenManager:
             Nested dictionary representing the directory structure
         """
         garden_path = self.content_dir / garden_slug
-        if not garden_path.exists():
+        try:
+            root_is_dir = stat.S_ISDIR(os.stat(garden_path).st_mode)
+        except OSError:
             return None
 
-        def build_tree(path, current_depth=0):
+        # is_dir comes from the parent's scandir entry (or the root stat),
+        # so no node is stat()ed twice
+        def build_tree(path, is_dir, current_depth=0):
             if max_depth is not None and current_depth >= max_depth:
                 return None
 
@@ -158,33 +235,36 @@ class GardenManager:
                 'children': []
             }
 
-            if path.is_dir():
-                for item in sorted(path.iterdir()):
+            if is_dir:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+
+                for entry in entries:
                     # Skip hidden files and page.md files (they're implicit)
-                    if item.name.startswith('.') or item.name == 'page.md':
+                    if entry.name.startswith('.') or entry.name == 'page.md':
                         continue
 
                     # Skip config files
-                    if item.name in ['config.yaml', 'config.yml']:
+                    if entry.name in ['config.yaml', 'config.yml']:
                         continue
 
                     # Recurse into directories and .page directories
-                    if item.is_dir():
-                        subtree = build_tree(item, current_depth + 1)
+                    if entry.is_dir():
+                        subtree = build_tree(Path(entry.path), True, current_depth + 1)
                         if subtree:
                             tree['children'].append(subtree)
                     # Include .md files at this level
-                    elif item.suffix == '.md':
+                    elif entry.name.endswith('.md'):
                         tree['children'].append({
-                            'name': item.name,
-                            'path': str(item.relative_to(self.content_dir)),
+                            'name': entry.name,
+                            'path': os.path.relpath(entry.path, self.content_dir),
                             'is_page': False,
                             'children': []
                         })
 
             return tree
 
-        return build_tree(garden_path)
+        return build_tree(garden_path, root_is_dir)
 
     def get_breadcrumbs(self, garden_slug, article_path):
         """Generate breadcrumb trail for an article path
@@ -1,15 +1,39 @@
+import atexit
+import functools
+import logging
+import subprocess
+import threading
 import git
 from datetime import datetime
 
+# A child of the Flask app logger ('trellis'); batches are committed from
+# a timer thread or at exit, outside any app context
+logger = logging.getLogger(__name__)
+
 class GitHandler:
     def __init__(self, repo_path):
         self.repo = git.Repo(repo_path)
+        self.repo_path = str(repo_path)
+        # History for a path can only change when HEAD moves, so results
+        # are cached per (HEAD sha, filepath, limit)
+        self._history_cache = functools.lru_cache(maxsize=128)(self._load_file_history)
 
     def auto_commit(self, filepath, message):
-        """Commit changes to git"""
+        """Commit changes to git
+
+        A single `git commit --only` stages and commits just this file,
+        without GitPython reading and rewriting the whole index.
+        """
+        commit = ['git', '-C', self.repo_path, 'commit', '-m', message,
+                  '--only', '--', str(filepath)]
         try:
-            self.repo.index.add([filepath])
-            self.repo.index.commit(message)
+            result = subprocess.run(commit, capture_output=True, text=True)
+            if result.returncode != 0:
+                # --only only knows tracked paths; add a new file first
+                subprocess.run(['git', '-C', self.repo_path, 'add', '--', str(filepath)],
+                               check=True, capture_output=True)
+                subprocess.run(commit, check=True, capture_output=True)
+            self._history_cache.cache_clear()
             return True
         except Exception as e:
             print(f"Git commit error: {e}")
@@ -30,6 +54,7 @@ class GitHandler:
         try:
             origin = self.repo.remote('origin')
             origin.pull()
+            self._history_cache.cache_clear()
             return True
         except Exception as e:
             print(f"Git pull error: {e}")
@@ -37,10 +62,169 @@ class GitHandler:
 
     def get_file_history(self, filepath, limit=10):
         """Get commit history for file"""
-        commits = list(self.repo.iter_commits(paths=filepath, max_count=limit))
-        return [{
-            'hash': c.hexsha[:7],
-            'message': c.message.strip(),
-            'date': datetime.fromtimestamp(c.committed_date).strftime('%Y-%m-%d %H:%M'),
-            'author': str(c.author)
-        } for c in commits]
+        try:
+            head_sha = self.repo.head.commit.hexsha
+        except ValueError:
+            # No commits yet
+            return []
+        history = self._history_cache(head_sha, str(filepath), limit)
+        return [dict(entry) for entry in history]
+
+    def _load_file_history(self, head_sha, filepath, limit):
+        """Read history for file at the given HEAD (cached by the caller)
+
+        Uses plain `git log` rather than iter_commits, which builds a full
+        Commit object (tree, parents, actor) for every entry.
+        """
+        result = subprocess.run(
+            ['git', '-C', self.repo_path, 'log', f'-n{limit}',
+             '--pretty=format:%H%x1f%B%x1f%ct%x1f%an%x1e', head_sha, '--', filepath],
+            capture_output=True, text=True, check=True
+        )
+        history = []
+        for record in result.stdout.split('\x1e'):
+            record = record.lstrip('\n')
+            if not record:
+                continue
+            sha, message, committed, author = record.split('\x1f')
+            history.append({
+                'hash': sha[:7],
+                'message': message.strip(),
+                'date': datetime.fromtimestamp(int(committed)).strftime('%Y-%m-%d %H:%M'),
+                'author': author
+            })
+        return tuple(history)
+
+
+class GitBatcher:
+    """Coalesce auto-commits from a burst of editor saves into one commit
+
+    Saves register (path, message) pairs; a timer thread started by the
+    first save in a window runs one `git add` and one `git commit` for
+    everything queued, instead of a commit per save.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    # Flushes a path may fail before it is dropped from the queue
+    MAX_RETRIES = 3
+
+    def __init__(self, repo_path, delay=5.0):
+        self.repo_path = str(repo_path)
+        self.delay = delay
+        # path -> commit messages, each path queued once
+        self._pending = {}
+        # path -> failed flushes so far
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        # Don't lose queued commits when the process exits
+        atexit.register(self.flush)
+
+    @classmethod
+    def get(cls, repo_path, delay=5.0):
+        """Return the process-wide batcher for a repository"""
+        key = str(repo_path)
+        with cls._instances_lock:
+            batcher = cls._instances.get(key)
+            if batcher is None:
+                batcher = cls._instances[key] = cls(key, delay)
+            return batcher
+
+    def enqueue(self, filepath, message):
+        """Queue a file to be committed in the next batch"""
+        with self._lock:
+            messages = self._pending.setdefault(str(filepath), [])
+            if message not in messages:
+                messages.append(message)
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Commit everything queued so far"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending = self._pending
+            self._pending = {}
+
+        if not pending:
+            return False
+
+        paths = list(pending)
+        messages = list(dict.fromkeys(msg for msgs in pending.values() for msg in msgs))
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = f"Batch update ({len(paths)} files)\n\n" + '\n'.join(messages)
+
+        if self._commit(paths, message):
+            for path in paths:
+                self._failures.pop(path, None)
+            return True
+
+        # One bad path fails the whole batch; commit the files one by one
+        # so the rest still go in, and keep what still fails for next time
+        failed = {}
+        gave_up = False
+        for path, path_messages in pending.items():
+            if self._commit([path], '\n'.join(path_messages)):
+                self._failures.pop(path, None)
+                continue
+            failures = self._failures.get(path, 0) + 1
+            if not self._has_changes(path):
+                logger.warning("Git commit skipped, nothing to commit: %s", path)
+            elif failures >= self.MAX_RETRIES:
+                logger.error("Git commit of %s failed %d times, giving up", path, failures)
+                gave_up = True
+            else:
+                self._failures[path] = failures
+                failed[path] = path_messages
+                continue
+            self._failures.pop(path, None)
+
+        if failed:
+            with self._lock:
+                # No new timer: they go out with the next save's batch or at
+                # exit. Saves made meanwhile keep their place after these.
+                for path, messages in self._pending.items():
+                    merged = failed.setdefault(path, [])
+                    merged.extend(msg for msg in messages if msg not in merged)
+                self._pending = failed
+        return not failed and not gave_up
+
+    def _commit(self, paths, message):
+        """Stage and commit exactly these paths
+
+        --only keeps anything else staged in the repository out of the
+        commit, like GitHandler.auto_commit.
+        """
+        try:
+            subprocess.run(['git', '-C', self.repo_path, 'add', '--', *paths],
+                           check=True, capture_output=True, text=True)
+            subprocess.run(['git', '-C', self.repo_path, 'commit', '-m', message,
+                            '--only', '--', *paths],
+                           check=True, capture_output=True, text=True)
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error("Git commit error: %s: %s", e, (e.stderr or '').strip())
+            return False
+        except OSError as e:
+            logger.error("Git commit error: %s", e)
+            return False
+
+    def _has_changes(self, path):
+        """Whether git still sees uncommitted changes to path
+
+        False when git status itself fails (not a repository, path outside
+        it, ...): retrying would fail the same way.
+        """
+        result = subprocess.run(['git', '-C', self.repo_path, 'status', '--porcelain', '--', path],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.error("Git status error for %s: %s", path, result.stderr.strip())
+            return False
+        return bool(result.stdout.strip())
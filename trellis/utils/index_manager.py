@@ -6,10 +6,58 @@ Manages both search index and content index with support for:
 - Deferred updates via dirty flag (optional)
 - Change detection
 """
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# Below this many articles, starting worker processes costs more than it saves
+PARALLEL_PARSE_THRESHOLD = 32
+
+# How long is_dirty() trusts its last look at the dirty flag (seconds)
+DIRTY_CACHE_TTL = 1.0
+
+
+def _parse_for_index(task):
+    """Parse one article for indexing (runs in a worker process)
+
+    Args:
+        task: (content_dir, data_dir, filename) tuple
+
+    Returns:
+        (metadata, text) tuple, or None if the file could not be parsed
+    """
+    from trellis.utils.markdown_handler import MarkdownHandler
+
+    content_dir, data_dir, filename = task
+    try:
+        result = MarkdownHandler(content_dir, data_dir).parse_file(filename, for_index=True)
+    except Exception as e:
+        print(f"Error reading {Path(content_dir) / filename}: {e}")
+        return None
+    return result['metadata'], result['content']
+
+
+def parse_for_index(tasks):
+    """Parse many articles, using a process pool for large batches
+
+    Frontmatter parsing and text extraction are pure Python, so threads
+    would serialize on the GIL; separate processes scale with cores.
+
+    Args:
+        tasks: List of (content_dir, data_dir, filename) tuples
+
+    Returns:
+        List of _parse_for_index() results, in task order
+    """
+    if len(tasks) < PARALLEL_PARSE_THRESHOLD:
+        return [_parse_for_index(task) for task in tasks]
+
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_parse_for_index, tasks, chunksize=16))
+
 
 class IndexManager:
     """Manages incremental and deferred index updates"""
@@ -32,6 +80,11 @@ class IndexManager:
         self.deferred = deferred
 
         self.dirty_flag_path = self.data_dir / '.index_dirty'
+        # The manifest is moved here while a rebuild consumes it, so saves
+        # during the rebuild start a fresh one
+        self.dirty_processing_path = self.data_dir / '.index_dirty.processing'
+        # (checked_at, is_dirty) from the last is_dirty() stat
+        self._dirty_cache = (float('-inf'), False)
 
         # Lazy load indexes to avoid circular imports
         self._content_index = None
@@ -51,19 +104,88 @@ class IndexManager:
             self._search_index = SearchIndex(self.data_dir)
         return self._search_index
 
-    def set_dirty_flag(self):
-        """Mark indexes as needing rebuild"""
+    def set_dirty_flag(self, file_path=None, garden_slug=None):
+        """Mark indexes as needing rebuild
+
+        The flag file is a manifest with one JSON line per changed file.
+        Without file_path the entry requests a full rebuild.
+
+        Args:
+            file_path: Changed file relative to content_dir (optional)
+            garden_slug: Garden slug if file is in a garden (optional)
+        """
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.dirty_flag_path.write_text(datetime.now().isoformat())
+        entry = {
+            'file': str(file_path) if file_path is not None else None,
+            'garden': garden_slug,
+            'time': datetime.now().isoformat(),
+        }
+        with open(self.dirty_flag_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self._dirty_cache = (time.monotonic(), True)
 
     def clear_dirty_flag(self):
         """Clear the dirty flag"""
         if self.dirty_flag_path.exists():
             self.dirty_flag_path.unlink()
+        self._dirty_cache = (time.monotonic(), False)
 
     def is_dirty(self):
-        """Check if indexes need rebuilding"""
-        return self.dirty_flag_path.exists()
+        """Check if indexes need rebuilding
+
+        The answer is reused for DIRTY_CACHE_TTL seconds; the flag only
+        flips on saves, so a slightly stale answer is harmless.
+        """
+        checked_at, dirty = self._dirty_cache
+        now = time.monotonic()
+        if now - checked_at < DIRTY_CACHE_TTL:
+            return dirty
+        dirty = os.path.exists(self.dirty_flag_path)
+        self._dirty_cache = (now, dirty)
+        return dirty
+
+    def _locate(self, file_path, garden_slug=None):
+        """Work out how a changed file is listed, matching _rebuild_all()
+
+        Callers pass paths relative to content_dir, so a garden file
+        arrives as 'blog/post.md' with garden_slug 'blog', and an edited
+        .page directory as its 'page.md'.
+
+        Returns:
+            (url, source_file, garden_slug, directory, filename) where
+            filename is relative to directory, or None for files that are
+            not articles
+        """
+        path = Path(file_path)
+        if path.name == 'page.md' and path.parent.suffix == '.page':
+            path = path.parent
+        parts = path.parts
+        # Markdown files inside a .page directory are its subpages, listed
+        # like any other; everything else there is an asset
+        if path.suffix not in ('.md', '.page'):
+            return None
+
+        if garden_slug and len(parts) > 1 and parts[0] == garden_slug:
+            # Relative to content_dir; make it relative to the garden
+            filename = Path(*parts[1:]).as_posix()
+        else:
+            if garden_slug and parts == (garden_slug,):
+                # A root-level .page directory, taken for a garden
+                garden_slug = None
+            filename = path.as_posix()
+
+        from trellis.utils.markdown_handler import MarkdownHandler
+        slug = MarkdownHandler.generate_slug(filename)
+        if garden_slug:
+            return (f"/garden/{garden_slug}/{slug}", f"{garden_slug}/{filename}",
+                    garden_slug, self.content_dir / garden_slug, filename)
+        return (f"/page/{slug}", filename, '', self.content_dir, filename)
+
+    @staticmethod
+    def _article_file(directory, filename):
+        """The markdown file behind an article (page.md for a .page directory)"""
+        path = directory / filename
+        return path / 'page.md' if path.suffix == '.page' else path
 
     def update_file(self, file_path, garden_slug=None):
         """Update indexes for a single file
@@ -73,62 +195,63 @@ class IndexManager:
             garden_slug: Garden slug if file is in a garden (optional)
         """
         if self.deferred:
-            # Just set dirty flag
-            self.set_dirty_flag()
+            # Just record the file in the dirty manifest
+            self.set_dirty_flag(file_path, garden_slug)
             return
 
-        # Immediate incremental update
+        self._update_file_now(file_path, garden_slug)
+
+    def _update_file_now(self, file_path, garden_slug=None, search_documents=None):
+        """Parse a single file and write it to both indexes
+
+        If search_documents is a list, the search document is appended to
+        it for the caller to write in bulk instead of being written here.
+
+        Returns:
+            True if the file was indexed
+        """
         try:
             from trellis.utils.markdown_handler import MarkdownHandler
 
-            # Determine full path
-            full_path = self.content_dir / file_path
-
-            # Check if it's a .page directory
-            if full_path.suffix == '.page' and full_path.is_dir():
-                full_path = full_path / 'page.md'
+            located = self._locate(file_path, garden_slug)
+            if located is None:
+                return False
+            url, source_file, garden_slug, directory, filename = located
 
-            # Skip if not a markdown file
-            if not full_path.suffix == '.md' or not full_path.exists():
-                return
+            # Skip if the article is gone
+            if not self._article_file(directory, filename).is_file():
+                return False
 
             # Parse the file
-            handler = MarkdownHandler(self.content_dir, self.data_dir)
-            result = handler.parse_file(file_path)
+            handler = MarkdownHandler(directory, self.data_dir)
+            result = handler.parse_file(filename, for_index=True)
             metadata = result['metadata']
-            html = result['content']
-
-            # Generate URL
-            if garden_slug:
-                # Remove .page extension and generate slug
-                slug = handler.generate_slug(file_path)
-                url = f"/garden/{garden_slug}/{slug}"
-                source_file = f"{garden_slug}/{file_path}"
-            else:
-                # Root-level page
-                slug = handler.generate_slug(file_path)
-                url = f"/page/{slug}"
-                source_file = file_path
+            text = result['content']
 
             # Update content index
             content_index = self._get_content_index()
             content_index.upsert_page(url, source_file, metadata, self.content_dir)
 
             # Update search index
-            search_index = self._get_search_index()
-            search_index.add_document(
-                url=url,
-                source_file=source_file,
-                title=metadata.get('title', ''),
-                description=metadata.get('description', ''),
-                content=html,
-                garden=garden_slug or '',
-                status=metadata.get('status', 'published')
-            )
+            document = {
+                'url': url,
+                'source_file': source_file,
+                'title': metadata.get('title', ''),
+                'description': metadata.get('description', ''),
+                'content': text,
+                'garden': garden_slug,
+                'status': metadata.get('status', 'published'),
+            }
+            if search_documents is not None:
+                search_documents.append(document)
+            else:
+                self._get_search_index().add_document(**document)
+            return True
 
         except Exception as e:
             # Log but don't fail the save operation
             print(f"Warning: Failed to update indexes for {file_path}: {e}")
+            return False
 
     def remove_file(self, file_path, garden_slug=None):
         """Remove a file from indexes
@@ -138,30 +261,39 @@ class IndexManager:
             garden_slug: Garden slug if file is in a garden (optional)
         """
         if self.deferred:
-            self.set_dirty_flag()
+            self.set_dirty_flag(file_path, garden_slug)
             return
 
-        try:
-            from trellis.utils.markdown_handler import MarkdownHandler
+        self._remove_file_now(file_path, garden_slug)
 
-            # Generate URL
-            handler = MarkdownHandler(self.content_dir, self.data_dir)
-            slug = handler.generate_slug(file_path)
+    def _remove_file_now(self, file_path, garden_slug=None, search_removals=None):
+        """Remove a single file from both indexes
 
-            if garden_slug:
-                url = f"/garden/{garden_slug}/{slug}"
-            else:
-                url = f"/page/{slug}"
+        If search_removals is a list, the URL is appended to it for the
+        caller to remove in bulk instead of being removed here.
+
+        Returns:
+            True if the file was removed
+        """
+        try:
+            located = self._locate(file_path, garden_slug)
+            if located is None:
+                return False
+            url = located[0]
 
             # Remove from both indexes
             content_index = self._get_content_index()
             content_index.delete_page(url)
 
-            search_index = self._get_search_index()
-            search_index.remove_document(url)
+            if search_removals is not None:
+                search_removals.append(url)
+            else:
+                self._get_search_index().remove_document(url)
+            return True
 
         except Exception as e:
             print(f"Warning: Failed to remove {file_path} from indexes: {e}")
+            return False
 
     def rebuild_if_dirty(self):
         """Rebuild indexes if dirty flag is set
@@ -172,7 +304,104 @@ class IndexManager:
         if not self.is_dirty():
             return {'rebuilt': False, 'count': 0}
 
-        # Rebuild both indexes
+        # Recover work claimed by a run that died part-way
+        self._restore_dirty_manifest()
+
+        try:
+            os.replace(self.dirty_flag_path, self.dirty_processing_path)
+        except FileNotFoundError:
+            self._dirty_cache = (time.monotonic(), False)
+            return {'rebuilt': False, 'count': 0}
+        self._dirty_cache = (time.monotonic(), False)
+
+        entries = self._read_dirty_manifest()
+        try:
+            if entries is None:
+                count = self._rebuild_all()
+            else:
+                count = self._apply_dirty_entries(entries)
+        except Exception:
+            # Put the work back so the next run retries it
+            self._restore_dirty_manifest()
+            raise
+
+        if self.dirty_processing_path.exists():
+            self.dirty_processing_path.unlink()
+
+        return {'rebuilt': True, 'count': count}
+
+    def _read_dirty_manifest(self):
+        """Read the claimed dirty manifest
+
+        Returns:
+            Dict of file_path -> garden_slug for an incremental update, or
+            None when a full rebuild is needed (explicit request, empty or
+            unreadable manifest, e.g. an old timestamp-only flag file)
+        """
+        entries = {}
+        try:
+            with open(self.dirty_processing_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if not entry.get('file'):
+                        return None
+                    # Later entries for the same file win
+                    entries[entry['file']] = entry.get('garden')
+        except (ValueError, AttributeError):
+            return None
+
+        return entries or None
+
+    def _restore_dirty_manifest(self):
+        """Merge a claimed manifest back into the dirty flag after a failure"""
+        try:
+            pending = self.dirty_processing_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return
+        if pending and not pending.endswith('\n'):
+            pending += '\n'
+        with open(self.dirty_flag_path, 'a', encoding='utf-8') as f:
+            f.write(pending)
+        self.dirty_processing_path.unlink()
+        self._dirty_cache = (time.monotonic(), True)
+
+    def _apply_dirty_entries(self, entries):
+        """Update or remove just the files listed in the manifest
+
+        Returns:
+            Number of files indexed or removed
+        """
+        content_index = self._get_content_index()
+        documents = []
+        removals = []
+        count = 0
+        with content_index.transaction():
+            for file_path, garden_slug in entries.items():
+                located = self._locate(file_path, garden_slug)
+                if located is None:
+                    continue
+                directory, filename = located[3:]
+                if self._article_file(directory, filename).is_file():
+                    count += self._update_file_now(file_path, garden_slug, documents)
+                else:
+                    count += self._remove_file_now(file_path, garden_slug, removals)
+
+        # One search index commit for each kind of change
+        search_index = self._get_search_index()
+        if removals:
+            search_index.remove_documents(removals)
+        if documents:
+            search_index.add_documents(documents)
+        return count
+
+    def _rebuild_all(self):
+        """Rebuild both indexes from every article on disk
+
+        Returns:
+            Number of documents indexed
+        """
         from trellis.models.content_index import ContentIndex
         from trellis.utils.search_index import SearchIndex
         from trellis.utils.markdown_handler import MarkdownHandler
@@ -181,44 +410,59 @@ class IndexManager:
         content_index = ContentIndex(self.data_dir)
         search_index = SearchIndex(self.data_dir)
 
-        # Clear content index
-        content_index.clear_index()
-
-        # Rebuild search index (which clears it)
-        count = search_index.rebuild_index(self.content_dir)
+        # Collect every article first; listing only reads frontmatter
+        # Each entry: (url, source_file, garden_slug, directory, filename)
+        articles = []
 
-        # Rebuild content index
-        garden_manager = GardenManager(self.content_dir)
-        gardens = garden_manager.get_gardens()
-
-        # Index root-level pages
+        # Root-level pages (order doesn't matter, so skip the date sort)
         handler = MarkdownHandler(self.content_dir, self.data_dir)
-        for item in handler.list_items():
+        for item in handler.list_items(sort=None):
             if item.get('type') in ['markdown', 'page']:
-                url = f"/page/{item['slug']}"
-                content_index.upsert_page(
-                    url=url,
-                    source_file=item['filename'],
-                    metadata=item['metadata'],
-                    content_dir=self.content_dir
-                )
+                articles.append((f"/page/{item['slug']}", item['filename'], '',
+                                 self.content_dir, item['filename']))
 
-        # Index each garden
-        for garden in gardens:
+        # Each garden
+        garden_manager = GardenManager(self.content_dir)
+        for garden in garden_manager.get_gardens():
             garden_path = self.content_dir / garden['slug']
             handler = MarkdownHandler(garden_path, self.data_dir)
 
             for article in handler.list_articles(recursive=True):
                 if article.get('type') in ['markdown', 'page']:
-                    url = f"/garden/{garden['slug']}/{article['slug']}"
-                    content_index.upsert_page(
-                        url=url,
-                        source_file=f"{garden['slug']}/{article['filename']}",
-                        metadata=article['metadata'],
-                        content_dir=self.content_dir
-                    )
-
-        # Clear dirty flag
-        self.clear_dirty_flag()
+                    articles.append((f"/garden/{garden['slug']}/{article['slug']}",
+                                     f"{garden['slug']}/{article['filename']}",
+                                     garden['slug'], garden_path, article['filename']))
+
+        # Parse (the expensive part) in parallel, then feed both indexes
+        # from this process
+        tasks = [(str(directory), str(self.data_dir), filename)
+                 for _, _, _, directory, filename in articles]
+        parsed = parse_for_index(tasks)
+
+        # One SQLite transaction for the whole rebuild; the search index
+        # likewise gets a single writer/commit in rebuild_from_documents
+        documents = []
+        with content_index.transaction():
+            content_index.clear_index()
+            for (url, source_file, garden_slug, _, _), result in zip(articles, parsed):
+                if result is None:
+                    continue
+                metadata, text = result
 
-        return {'rebuilt': True, 'count': count}
+                content_index.upsert_page(
+                    url=url,
+                    source_file=source_file,
+                    metadata=metadata,
+                    content_dir=self.content_dir
+                )
+                documents.append({
+                    'url': url,
+                    'source_file': source_file,
+                    'title': metadata.get('title', ''),
+                    'description': metadata.get('description', ''),
+                    'content': text,
+                    'garden': garden_slug,
+                    'status': metadata.get('status', 'published'),
+                })
+
+        return search_index.rebuild_from_documents(documents)
@@ -1,48 +1,249 @@
-import markdown
+import copy
+import functools
 import frontmatter
 import os
 from pathlib import Path
 from datetime import datetime
 import re
+import threading
+import yaml
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+MARKDOWN_EXTENSIONS = [
+    'fenced_code',
+    'codehilite',
+    'tables',
+    'toc',
+    'footnotes',
+    'attr_list'
+]
+
+# Slugs keep underscores and other characters as-is (existing URLs and
+# asset paths depend on that); only spaces become hyphens
+_SLUG_TRANS = str.maketrans({' ': '-'})
+
+_WIKILINK_RE = re.compile(r'\[\[([^\]]+)\]\]')
+_INCLUDE_RE = re.compile(r'\{\{include:\s*([^}]+)\}\}')
+_WIKI_OR_INCLUDE_RE = re.compile(r'\[\[([^\]]+)\]\]|\{\{include:\s*([^}]+)\}\}')
+
+# Markdown -> plain text for the search index and excerpts, applied in order
+_PLAINTEXT_SUBS = [
+    (re.compile(r'^[ \t]*(?:```|~~~).*$', re.MULTILINE), ''),    # code fences
+    (re.compile(r'<[^>]+>'), ''),                                  # inline HTML
+    (re.compile(r'!\[([^\]]*)\]\([^)]*\)'), r'\1'),               # images -> alt
+    (re.compile(r'\[\[([^\]|]+)\|([^\]]+)\]\]'), r'\2'),            # [[target|text]]
+    (re.compile(r'\[\[([^\]]+)\]\]'), r'\1'),                        # [[target]]
+    (re.compile(r'\[\^[^\]]*\]:?'), ''),                            # footnote marks
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r'\1'),                 # links -> text
+    (re.compile(r'^[ \t]{0,3}(?:#{1,6}|>+)[ \t]*', re.MULTILINE), ''),  # heading/quote marks
+    (re.compile(r'[*`~]+'), ''),                                   # emphasis/code marks
+]
+
+_thread_local = threading.local()
+
+
+def _date_sort_str(value):
+    """Normalize a frontmatter/config date to a sortable 'YYYY-MM-DD' string"""
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    return str(value) if value else '2000-01-01'
+
+
+def _sorted_by_keys(items, keys, reverse=False):
+    """Sort items by precomputed key tuples (decorate-sort-undecorate)
+
+    The item index is the final tiebreak, so equal keys keep their
+    original order (as a stable sort would) and items themselves are
+    never compared.
+    """
+    if reverse:
+        decorated = [(*key, -i) for i, key in enumerate(keys)]
+    else:
+        decorated = [(*key, i) for i, key in enumerate(keys)]
+    decorated.sort(reverse=reverse)
+    return [items[abs(d[-1])] for d in decorated]
+
+
+@functools.lru_cache(maxsize=256)
+def _read_include_cached(path_str, mtime_ns, size):
+    """Read an include file; mtime/size are part of the key so edits evict it"""
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=4096)
+def _generate_slug(filename):
+    """Slug for a filename string (see MarkdownHandler.generate_slug)"""
+    path = Path(filename)
+
+    # Remove .page extension from any part of the path
+    parts = []
+    for part in path.parts:
+        if part.endswith('.page'):
+            parts.append(part[:-5])  # Remove .page extension
+        elif part.endswith('.md'):
+            parts.append(Path(part).stem)  # Remove .md extension
+        else:
+            parts.append(part)
+
+    slug = '/'.join(parts)
+    return slug.lower().translate(_SLUG_TRANS)
+
+
+class _YAMLHandler(frontmatter.YAMLHandler):
+    """YAML frontmatter handler that always parses with the C loader if present"""
+
+    def load(self, fm, **kwargs):
+        return yaml.load(fm, Loader=SafeLoader)
+
+
+_YAML_HANDLER = _YAMLHandler()
+
+# Metadata-only reads start with this many characters and grow as needed
+_HEAD_READ_SIZE = 4096
+_EXCERPT_LENGTH = 200
+
+
+def _to_plaintext(content):
+    """Reduce markdown to plain text without rendering it"""
+    for pattern, replacement in _PLAINTEXT_SUBS:
+        content = pattern.sub(replacement, content)
+    return content
+
+
+def _excerpt_text(content):
+    """Plain text of content for excerpts, whitespace collapsed"""
+    return ' '.join(_to_plaintext(_INCLUDE_RE.sub('', content)).split())
+
+
+def _excerpt_end(content, length):
+    """Where an excerpt of content can stop, or None to use all of it
+
+    Excerpts are cut at a blank line, so markup is never split
+    mid-construct, once the text before it is longer than length.
+    Breaks are tried at roughly doubling offsets; the result depends only
+    on the content up to the returned break, so _read_head() can stop
+    reading there.
+    """
+    pos = content.find('\n\n', length)
+    while pos != -1:
+        if len(_excerpt_text(content[:pos])) > length:
+            return pos
+        pos = content.find('\n\n', max(pos + 2, 2 * pos))
+    return None
+
+
+def _load_post(text):
+    """Split text into frontmatter and body
+
+    The YAML handler is passed directly instead of letting frontmatter
+    sniff the format; other formats still get detected.
+    """
+    handler = _YAML_HANDLER if _YAML_HANDLER.detect(text) else None
+    return frontmatter.loads(text, handler=handler)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_metadata_cached(path_str, mtime_ns, size):
+    """(metadata, excerpt) of a markdown file; mtime/size are part of the key
+
+    Listings parse every article on each request, so unchanged files are
+    only read once. Callers must copy the metadata before handing it out.
+    """
+    post = _load_post(MarkdownHandler._read_head(path_str))
+    return post.metadata, MarkdownHandler.extract_excerpt(post.content)
+
+
+def _get_markdown():
+    """Return this thread's shared Markdown converter, building it on first use
+
+    Loading the extensions (codehilite pulls in Pygments) costs far more
+    than a conversion, and handlers are created per request and per
+    garden. Markdown objects are not thread-safe, so each thread gets one.
+    """
+    md = getattr(_thread_local, 'md', None)
+    if md is None:
+        # Imported here so metadata-only work (listings) never loads
+        # Markdown or its extensions
+        import markdown
+        md = _thread_local.md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    return md
+
 
 class MarkdownHandler:
     def __init__(self, content_dir, data_dir=None):
         self.content_dir = Path(content_dir)
         self.data_dir = Path(data_dir) if data_dir else None
-        self.md = markdown.Markdown(extensions=[
-            'fenced_code',
-            'codehilite',
-            'tables',
-            'toc',
-            'footnotes',
-            'attr_list'
-        ])
+        self._md = None
         self._content_index = None
         self._broken_links = []
 
-    def parse_file(self, filename):
+    @property
+    def md(self):
+        """Markdown converter, created on first conversion"""
+        if self._md is None:
+            self._md = _get_markdown()
+        return self._md
+
+    def parse_file(self, filename, metadata_only=False, for_index=False):
         """Parse markdown file and return metadata + content
 
         Supports both:
         - Direct .md files: article.md
         - .page directories: article.page/page.md
+
+        With metadata_only=True the HTML conversion (and include/wiki-link
+        processing) is skipped; the result has 'excerpt' instead of
+        'content'/'raw_content'. Listings only need that much.
+
+        With for_index=True 'content' is plain text for the search index:
+        includes are expanded but there is no HTML rendering and no
+        wiki-link lookup (links keep their display text).
         """
         filepath = self.content_dir / filename
 
         # If filename points to a .page directory, look for page.md inside
-        if filepath.is_dir() and filepath.suffix == '.page':
+        if filepath.suffix == '.page' and filepath.is_dir():
             filepath = filepath / 'page.md'
             if not filepath.exists():
                 raise FileNotFoundError(f"page.md not found in {filename}")
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            post = frontmatter.load(f)
+        if metadata_only:
+            st = filepath.stat()
+            metadata, excerpt = _parse_metadata_cached(str(filepath.resolve()),
+                                                       st.st_mtime_ns, st.st_size)
+            return {
+                'metadata': copy.deepcopy(metadata),
+                'excerpt': excerpt,
+                'slug': self.generate_slug(filename),
+                'is_page_dir': filepath.name == 'page.md'
+            }
+
+        post = _load_post(filepath.read_text(encoding='utf-8'))
+
+        if for_index:
+            processed_content = self._process_includes(post.content, filepath.parent)
+            return {
+                'metadata': post.metadata,
+                'content': _to_plaintext(processed_content),
+                'raw_content': post.content,
+                'slug': self.generate_slug(filename),
+                'is_page_dir': filepath.name == 'page.md'
+            }
 
         # Process includes and wiki-links before converting to HTML
-        processed_content = self._process_includes(post.content, filepath.parent)
-        processed_content = self._process_wikilinks(processed_content)
+        processed_content = self._process_extensions(post.content, filepath.parent)
 
-        html_content = self.md.convert(processed_content)
+        # Clear per-document extension state (footnotes, toc) left over
+        # from the previous conversion on this instance
+        md = self.md
+        md.reset()
+        html_content = md.convert(processed_content)
 
         result = {
             'metadata': post.metadata,
@@ -59,6 +260,37 @@ class MarkdownHandler:
 
         return result
 
+    @staticmethod
+    def _read_head(filepath):
+        """Read only as much of a file as a metadata-only parse needs
+
+        That is the YAML frontmatter plus enough body for extract_excerpt()
+        to produce the same excerpt as from the whole file. Files without
+        YAML frontmatter are read whole.
+        """
+        boundary = _YAML_HANDLER.FM_BOUNDARY
+        with open(filepath, 'r', encoding='utf-8') as f:
+            text = f.read(_HEAD_READ_SIZE)
+            if not boundary.match(text):
+                return text + f.read()
+
+            while True:
+                matches = boundary.finditer(text)
+                next(matches)
+                closing = next(matches, None)
+                if closing is not None:
+                    # frontmatter strips the body; the stopping break must
+                    # be followed by more text to be in the stripped body
+                    body = text[closing.end():].lstrip()
+                    end = _excerpt_end(body, _EXCERPT_LENGTH)
+                    if end is not None and body[end + 2:].strip():
+                        return text
+
+                more = f.read(len(text))
+                if not more:
+                    return text
+                text += more
+
     def _get_content_index(self):
         """Lazy-load content index for wiki-link resolution"""
         if self._content_index is None and self.data_dir:
@@ -66,105 +298,147 @@ class MarkdownHandler:
             self._content_index = ContentIndex(self.data_dir)
         return self._content_index
 
-    def _process_wikilinks(self, content):
-        """Process [[Page Title]] wiki-link syntax
+    def _process_extensions(self, content, base_path):
+        """Expand {{include: filename}} and [[wiki-links]] in one pass
 
-        Supports:
+        Wiki-link syntax:
         - [[Page Title]] - Link by title
         - [[page-slug]] - Link by slug/path
         - [[Page Title|Custom Text]] - Custom display text
         - [[garden/page-slug]] - Garden-specific slug
 
-        Returns markdown links: [text](url)
+        Wiki-links become markdown links: [text](url). Included text is
+        scanned for wiki-links too, but not for further includes.
         Tracks broken links in self._broken_links
         """
-        wikilink_pattern = r'\[\[([^\]]+)\]\]'
+        # Most pages use neither; skip the regex scan entirely
+        if '[[' not in content and '{{include:' not in content:
+            return content
+
+        # Split into literal text and (link_text,) wiki-link segments
+        segments = []
+        last = 0
+        for match in _WIKI_OR_INCLUDE_RE.finditer(content):
+            segments.append(content[last:match.start()])
+            if match.group(1) is not None:
+                segments.append((match.group(1).strip(),))
+            else:
+                included = self._read_include(match.group(2).strip(), base_path)
+                self._split_wikilinks(included, segments)
+            last = match.end()
+        segments.append(content[last:])
 
-        def replace_wikilink(match):
-            link_text = match.group(1).strip()
+        # Resolve each distinct target once, up front
+        targets = {self._split_link(seg[0])[0] for seg in segments if isinstance(seg, tuple)}
+        if not targets:
+            return ''.join(segments)
+        resolved = self._resolve_wikilinks(targets)
 
-            # Parse custom display text if present
-            if '|' in link_text:
-                target, display_text = link_text.split('|', 1)
-                target = target.strip()
-                display_text = display_text.strip()
-            else:
-                target = link_text
-                display_text = None
+        return ''.join(seg if isinstance(seg, str) else self._render_wikilink(seg[0], resolved)
+                       for seg in segments)
 
-            # Try to resolve the link
-            page = self._resolve_wikilink(target)
+    @staticmethod
+    def _split_wikilinks(text, segments):
+        """Append text to segments, splitting out any wiki-links"""
+        if '[[' not in text:
+            segments.append(text)
+            return
+        last = 0
+        for match in _WIKILINK_RE.finditer(text):
+            segments.append(text[last:match.start()])
+            segments.append((match.group(1).strip(),))
+            last = match.end()
+        segments.append(text[last:])
 
-            if page:
-                url = page['url']
-                title = display_text or page['title'] or target
-                return f"[{title}]({url})"
-            else:
-                # Broken link - preserve original syntax and track it
-                self._broken_links.append(target)
-                # Return a span with broken-link class for styling
-                return f'<span class="broken-wikilink" title="Page not found: {target}">[[{link_text}]]</span>'
+    @staticmethod
+    def _split_link(link_text):
+        """Split '[[target|text]]' contents into (target, display text or None)"""
+        # Parse custom display text if present
+        if '|' in link_text:
+            target, display_text = link_text.split('|', 1)
+            return target.strip(), display_text.strip()
+        return link_text, None
+
+    def _render_wikilink(self, link_text, resolved):
+        """Markdown for one wiki-link, given the resolved targets"""
+        target, display_text = self._split_link(link_text)
+        page = resolved.get(target)
 
-        return re.sub(wikilink_pattern, replace_wikilink, content)
+        if page:
+            url = page['url']
+            title = display_text or page['title'] or target
+            return f"[{title}]({url})"
+        else:
+            # Broken link - preserve original syntax and track it
+            self._broken_links.append(target)
+            # Return a span with broken-link class for styling
+            return f'<span class="broken-wikilink" title="Page not found: {target}">[[{link_text}]]</span>'
 
-    def _resolve_wikilink(self, target):
-        """Resolve a wiki-link target to a page
+    def _resolve_wikilinks(self, targets):
+        """Resolve wiki-link targets to pages
 
         Args:
-            target: Page title or slug to find
+            targets: Set of page titles or slugs to find
 
         Returns:
-            Page dict with url and title, or None if not found
+            Dict of target -> page dict with url and title; unresolved
+            targets are left out
         """
         content_index = self._get_content_index()
-        if not content_index:
-            return None
+        if not content_index or not targets:
+            return {}
 
-        # Try exact title match first (case-insensitive)
-        page = content_index.find_page_by_title(target)
-        if page:
-            return page
+        # Try exact title match first (case-insensitive), all in one query
+        resolved = content_index.find_pages_by_titles(targets)
 
-        # Try as slug/path
-        page = content_index.find_page_by_slug(target)
-        if page:
-            return page
+        for target in targets:
+            if target in resolved:
+                continue
 
-        # Try fuzzy title match as fallback
-        fuzzy_matches = content_index.find_pages_by_title_fuzzy(target, limit=1)
-        if fuzzy_matches:
-            return fuzzy_matches[0]
+            # Try as slug/path
+            page = content_index.find_page_by_slug(target)
+            if page:
+                resolved[target] = page
+                continue
 
-        return None
+            # Try fuzzy title match as fallback
+            fuzzy_matches = content_index.find_pages_by_title_fuzzy(target, limit=1)
+            if fuzzy_matches:
+                resolved[target] = fuzzy_matches[0]
+
+        return resolved
 
     def _process_includes(self, content, base_path):
         """Process {{include: filename}} syntax in markdown content"""
-        include_pattern = r'\{\{include:\s*([^\}]+)\}\}'
-
-        def replace_include(match):
-            include_file = match.group(1).strip()
-            include_path = base_path / include_file
-
-            try:
-                with open(include_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            except FileNotFoundError:
-                return f"<!-- Include not found: {include_file} -->"
-            except Exception as e:
-                return f"<!-- Error including {include_file}: {e} -->"
-
-        return re.sub(include_pattern, replace_include, content)
+        # Most pages have no includes; skip the regex scan entirely
+        if '{{include:' not in content:
+            return content
+
+        return _INCLUDE_RE.sub(
+            lambda match: self._read_include(match.group(1).strip(), base_path), content)
+
+    def _read_include(self, include_file, base_path):
+        """Text for one {{include: filename}} (or an HTML comment on error)"""
+        include_path = base_path / include_file
+
+        # Shared snippets are included by many pages; read each version once
+        try:
+            st = os.stat(include_path)
+            return _read_include_cached(str(include_path), st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return f"<!-- Include not found: {include_file} -->"
+        except Exception as e:
+            return f"<!-- Error including {include_file}: {e} -->"
 
     def save_file(self, filename, metadata, content):
         """Save markdown file with frontmatter"""
         filepath = self.content_dir / filename
         post = frontmatter.Post(content, **metadata)
-
         filepath.parent.mkdir(parents=True, exist_ok=True)
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(frontmatter.dumps(post))
 
-    def list_items(self):
+    def list_items(self, sort='date'):
         """List all items in the current directory (non-recursive)
 
         Returns three types of items:
@@ -172,52 +446,62 @@ class MarkdownHandler:
         - page directories (.page)
         - content directories (regular directories)
 
+        Args:
+            sort: 'date' orders by published/created date from frontmatter
+                  or config; None keeps name order and skips the sort, for
+                  callers that don't care about order
+
         Returns:
             List of item dictionaries with type, metadata, and display info
         """
         items = []
+        garden_mgr = None
 
-        if not self.content_dir.exists():
+        try:
+            with os.scandir(self.content_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except FileNotFoundError:
             return items
 
-        for item in sorted(self.content_dir.iterdir()):
+        for entry in entries:
+            name = entry.name
             # Skip hidden files and config.yaml
-            if item.name.startswith('.') or item.name in ['config.yaml', 'config.yml']:
+            if name.startswith('.') or name in ['config.yaml', 'config.yml']:
                 continue
 
             try:
-                if item.is_file() and item.suffix == '.md':
+                if name.endswith('.md') and entry.is_file():
                     # Markdown file
-                    article = self.parse_file(item.name)
-                    article['filename'] = item.name
+                    article = self.parse_file(name, metadata_only=True)
+                    article['filename'] = name
                     article['type'] = 'markdown'
-                    article['name'] = item.stem
+                    article['name'] = name[:-3]
                     items.append(article)
 
-                elif item.is_dir() and item.suffix == '.page':
+                elif name.endswith('.page') and entry.is_dir():
                     # Page directory
-                    page_md = item / 'page.md'
-                    if page_md.exists():
-                        article = self.parse_file(item.name)
-                        article['filename'] = item.name
+                    if os.path.exists(os.path.join(entry.path, 'page.md')):
+                        article = self.parse_file(name, metadata_only=True)
+                        article['filename'] = name
                         article['type'] = 'page'
-                        article['name'] = item.stem.replace('.page', '')
+                        article['name'] = name[:-5]
                         items.append(article)
 
-                elif item.is_dir():
-                    # Content directory
-                    from trellis.utils.garden_manager import GardenManager
+                elif entry.is_dir():
+                    # Content directory; one manager serves the whole listing
+                    if garden_mgr is None:
+                        from trellis.utils.garden_manager import GardenManager
+                        garden_mgr = GardenManager(self.content_dir)
                     # Get or create config for this directory
-                    garden_mgr = GardenManager(self.content_dir)
-                    config = garden_mgr.get_or_create_config(item.name)
+                    config = garden_mgr.get_or_create_config(name)
 
                     items.append({
-                        'filename': item.name,
+                        'filename': name,
                         'type': 'directory',
-                        'name': item.name,
-                        'slug': self.generate_slug(item.name),
+                        'name': name,
+                        'slug': self.generate_slug(name),
                         'metadata': {
-                            'title': config.get('title', item.name.replace('-', ' ').title()),
+                            'title': config.get('title', name.replace('-', ' ').title()),
                             'description': config.get('description', ''),
                             'created_date': config.get('created_date'),
                             'published_date': config.get('created_date'),
@@ -226,25 +510,56 @@ class MarkdownHandler:
                         'config': config
                     })
             except Exception as e:
-                print(f"Error reading {item}: {e}")
+                print(f"Error reading {entry.path}: {e}")
 
-        # Sort: directories first, then by published/created date
-        def get_sort_key(item):
-            # Directories first
-            type_priority = {'directory': 0, 'page': 1, 'markdown': 1}
-            priority = type_priority.get(item.get('type', 'markdown'), 2)
-
-            # Then by date
-            pub_date = item['metadata'].get('published_date') or item['metadata'].get('created_date', '2000-01-01')
-            if hasattr(pub_date, 'strftime'):
-                date_str = pub_date.strftime('%Y-%m-%d')
-            else:
-                date_str = str(pub_date) if pub_date else '2000-01-01'
+        if sort is None:
+            return items
 
-            return (priority, date_str)
+        type_priority = {'directory': 0, 'page': 1, 'markdown': 1}
 
-        items.sort(key=get_sort_key, reverse=False)
-        return items
+        # Sort: directories first, then by published/created date
+        keys = []
+        for item in items:
+            metadata = item['metadata']
+            pub_date = metadata.get('published_date') or metadata.get('created_date', '2000-01-01')
+            keys.append((type_priority.get(item.get('type', 'markdown'), 2),
+                         _date_sort_str(pub_date)))
+        return _sorted_by_keys(items, keys)
+
+    @classmethod
+    def _walk(cls, dirpath, rel_dir=''):
+        """Yield (relative path, kind) for every article under dirpath
+
+        kind is 'md' for markdown files and 'page' for .page directories
+        that contain a page.md. One scandir per directory; hidden entries
+        are skipped, symlinked directories are listed but not descended.
+        Nested .page directories are still descended into (pages can
+        contain pages).
+        """
+        in_page_dir = dirpath.endswith('.page')
+        subdirs = []
+        try:
+            it = os.scandir(dirpath)
+        except OSError:
+            # Missing or unreadable, as os.walk would skip it
+            return
+        with it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry)
+                # Skip page.md files inside .page directories (they're the page itself)
+                elif name.endswith('.md') and not (in_page_dir and name == 'page.md'):
+                    yield rel_dir + name, 'md'
+
+        for entry in subdirs:
+            rel_path = rel_dir + entry.name
+            if entry.name.endswith('.page') and os.path.isfile(os.path.join(entry.path, 'page.md')):
+                yield rel_path, 'page'
+            yield from cls._walk(entry.path, rel_path + os.sep)
 
     def list_articles(self, recursive=True):
         """List all articles recursively (for backwards compatibility)
@@ -252,61 +567,37 @@ class MarkdownHandler:
         This is kept for editor and other views that need all articles.
         For directory views, use list_items() instead.
         """
-        articles = []
-        seen_paths = set()
-
-        if recursive:
-            # Find all .md files
-            for md_file in self.content_dir.rglob('*.md'):
-                # Skip page.md files inside .page directories (they'll be found separately)
-                if md_file.name == 'page.md' and md_file.parent.suffix == '.page':
-                    continue
-
-                rel_path = md_file.relative_to(self.content_dir)
-                if str(rel_path) in seen_paths:
-                    continue
-                seen_paths.add(str(rel_path))
-
-                try:
-                    article = self.parse_file(rel_path)
-                    article['filename'] = str(rel_path)
-                    article['type'] = 'markdown'
-                    articles.append(article)
-                except Exception as e:
-                    print(f"Error reading {md_file}: {e}")
-
-            # Find all .page directories
-            for item in self.content_dir.rglob('*'):
-                if item.is_dir() and item.suffix == '.page':
-                    page_md = item / 'page.md'
-                    if not page_md.exists():
-                        continue
-
-                    rel_path = item.relative_to(self.content_dir)
-                    if str(rel_path) in seen_paths:
-                        continue
-                    seen_paths.add(str(rel_path))
-
-                    try:
-                        article = self.parse_file(rel_path)
-                        article['filename'] = str(rel_path)
-                        article['type'] = 'page'
-                        articles.append(article)
-                    except Exception as e:
-                        print(f"Error reading {item}: {e}")
-        else:
+        if not recursive:
             # Use list_items for non-recursive
             return self.list_items()
 
-        # Sort by published_date
-        def get_sort_key(article):
-            pub_date = article['metadata'].get('published_date', '2000-01-01')
-            if hasattr(pub_date, 'strftime'):
-                return pub_date.strftime('%Y-%m-%d')
-            return str(pub_date) if pub_date else '2000-01-01'
+        articles = []
+        pages = []
+        for rel_path, kind in self._walk(str(self.content_dir)):
+            if kind == 'page':
+                pages.append(rel_path)
+                continue
+            try:
+                article = self.parse_file(rel_path, metadata_only=True)
+                article['filename'] = rel_path
+                article['type'] = 'markdown'
+                articles.append(article)
+            except Exception as e:
+                print(f"Error reading {self.content_dir / rel_path}: {e}")
+
+        for rel_path in pages:
+            try:
+                article = self.parse_file(rel_path, metadata_only=True)
+                article['filename'] = rel_path
+                article['type'] = 'page'
+                articles.append(article)
+            except Exception as e:
+                print(f"Error reading {self.content_dir / rel_path}: {e}")
 
-        articles.sort(key=get_sort_key, reverse=True)
-        return articles
+        # Sort by published_date, newest first
+        keys = [(_date_sort_str(article['metadata'].get('published_date', '2000-01-01')),)
+                for article in articles]
+        return _sorted_by_keys(articles, keys, reverse=True)
 
     @staticmethod
     def generate_slug(filename):
@@ -317,23 +608,17 @@ class MarkdownHandler:
             'my-project.page' -> 'my-project'
             'section/project.page' -> 'section/project'
         """
-        path = Path(filename)
-
-        # Remove .page extension from any part of the path
-        parts = []
-        for part in path.parts:
-            if part.endswith('.page'):
-                parts.append(part[:-5])  # Remove .page extension
-            elif part.endswith('.md'):
-                parts.append(Path(part).stem)  # Remove .md extension
-            else:
-                parts.append(part)
-
-        slug = '/'.join(parts)
-        return slug.lower().replace(' ', '-')
+        # str() so 'a.md' and Path('a.md') share one cache entry
+        return _generate_slug(str(filename))
 
     @staticmethod
-    def extract_excerpt(content, length=200):
-        """Extract first N characters as excerpt"""
-        text = content.replace('#', '').replace('*', '').strip()
+    def extract_excerpt(content, length=_EXCERPT_LENGTH):
+        """Extract first N characters of plain text as excerpt
+
+        Markdown, HTML tags, wiki-link brackets and include directives are
+        reduced to their text, and only the leading paragraphs the excerpt
+        needs are processed.
+        """
+        end = _excerpt_end(content, length)
+        text = _excerpt_text(content if end is None else content[:end])
         return text[:length] + '...' if len(text) > length else text
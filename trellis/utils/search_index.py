@@ -9,12 +9,31 @@ invalid search queries (e.g., unmatched quotes, invalid syntax).
 """
 import os
 import re
+import threading
 from pathlib import Path
 from whoosh import index
 from whoosh.fields import Schema, TEXT, ID, STORED
 from whoosh.qparser import MultifieldParser, QueryParser
 from whoosh.qparser.dateparse import DateParserPlugin
 from whoosh.analysis import StemmingAnalyzer
+from whoosh.writing import AsyncWriter
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Opened indexes shared by every SearchIndex in the process, keyed by
+# index directory. A FileIndex re-reads the current TOC whenever a reader
+# or writer is opened, so sharing one never serves stale results.
+_INDEX_CACHE = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
+# Query parsers shared the same way; parse() keeps no per-query state.
+# Title matches count most, then description, then body text.
+_PARSER_CACHE = {}
+_FIELD_BOOSTS = {'title': 3.0, 'description': 1.5, 'content': 1.0}
+
+# Rebuilds with at least this many documents build segments in several
+# processes; below it, forking the helpers costs more than it saves
+MULTIPROC_WRITER_THRESHOLD = 1000
 
 
 class SearchIndex:
@@ -38,25 +57,64 @@ class SearchIndex:
             status=STORED,
         )
         self._index = None
+        self._parser = None
 
     def _ensure_index(self):
         """Create or open the search index"""
         if self._index is not None:
             return self._index
 
-        self.index_dir.mkdir(parents=True, exist_ok=True)
+        key = str(self.index_dir)
+        with _INDEX_CACHE_LOCK:
+            ix = _INDEX_CACHE.get(key)
+            if ix is None:
+                self.index_dir.mkdir(parents=True, exist_ok=True)
 
-        if index.exists_in(str(self.index_dir)):
-            self._index = index.open_dir(str(self.index_dir))
-        else:
-            self._index = index.create_in(str(self.index_dir), self.schema)
+                if index.exists_in(key):
+                    ix = index.open_dir(key)
+                else:
+                    ix = index.create_in(key, self.schema)
+                _INDEX_CACHE[key] = ix
 
+        self._index = ix
         return self._index
 
+    def _get_parser(self):
+        """Get the query parser for title, description and content"""
+        if self._parser is not None:
+            return self._parser
+
+        key = str(self.index_dir)
+        with _INDEX_CACHE_LOCK:
+            parser = _PARSER_CACHE.get(key)
+            if parser is None:
+                parser = MultifieldParser(
+                    ['title', 'description', 'content'],
+                    schema=self.schema,
+                    fieldboosts=_FIELD_BOOSTS
+                )
+                _PARSER_CACHE[key] = parser
+
+        self._parser = parser
+        return self._parser
+
     def _strip_html(self, html_content):
         """Remove HTML tags from content"""
-        clean = re.sub(r'<[^>]+>', '', html_content)
-        return clean
+        if '<' not in html_content:
+            return html_content
+        return _HTML_TAG_RE.sub('', html_content)
+
+    def _prepare_document(self, url, source_file, title, description, content, garden=None, status=None):
+        """Build the Whoosh field values for a document (HTML is stripped)"""
+        return {
+            'url': url,
+            'source_file': source_file,
+            'title': title or '',
+            'description': description or '',
+            'content': self._strip_html(content) if content else '',
+            'garden': garden or '',
+            'status': status or 'published',
+        }
 
     def add_document(self, url, source_file, title, description, content, garden=None, status=None):
         """Add or update a document in the search index
@@ -70,32 +128,54 @@ class SearchIndex:
             garden: Garden slug (optional)
             status: Article status (e.g. 'published', 'draft')
         """
+        self.add_documents([{
+            'url': url,
+            'source_file': source_file,
+            'title': title,
+            'description': description,
+            'content': content,
+            'garden': garden,
+            'status': status,
+        }])
+
+    def add_documents(self, documents):
+        """Add or update many documents with a single commit
+
+        Uses an AsyncWriter, so if another process holds the index lock
+        the commit finishes in a background thread instead of failing.
+
+        Args:
+            documents: Iterable of dicts with add_document()'s keyword arguments
+
+        Returns:
+            Number of documents written
+        """
         try:
-            ix = self._ensure_index()
-            writer = ix.writer()
-
-            # Strip HTML from content
-            clean_content = self._strip_html(content) if content else ''
-
-            writer.update_document(
-                url=url,
-                source_file=source_file,
-                title=title or '',
-                description=description or '',
-                content=clean_content,
-                garden=garden or '',
-                status=status or 'published',
-            )
+            writer = AsyncWriter(self._ensure_index())
+            count = 0
+            try:
+                for doc in documents:
+                    writer.update_document(**self._prepare_document(**doc))
+                    count += 1
+            except Exception:
+                writer.cancel()
+                raise
             writer.commit()
+            return count
         except Exception as e:
             print(f"Error adding document to search index: {e}")
+            return 0
 
     def remove_document(self, url):
         """Remove a document from the search index"""
+        self.remove_documents([url])
+
+    def remove_documents(self, urls):
+        """Remove many documents with a single commit"""
         try:
-            ix = self._ensure_index()
-            writer = ix.writer()
-            writer.delete_by_term('url', url)
+            writer = AsyncWriter(self._ensure_index())
+            for url in urls:
+                writer.delete_by_term('url', url)
             writer.commit()
         except Exception as e:
             print(f"Error removing document from search index: {e}")
@@ -121,14 +201,9 @@ class SearchIndex:
                 return {'results': [], 'error': None}
 
             with ix.searcher() as searcher:
-                # Search across title, description, and content
-                parser = MultifieldParser(
-                    ['title', 'description', 'content'],
-                    schema=self.schema
-                )
-
                 try:
-                    query = parser.parse(query_string)
+                    # Search across title, description, and content
+                    query = self._get_parser().parse(query_string)
                 except Exception as parse_error:
                     # Query parsing failed - likely invalid syntax
                     return {
@@ -177,34 +252,31 @@ class SearchIndex:
         """
         from trellis.utils.markdown_handler import MarkdownHandler
         from trellis.utils.garden_manager import GardenManager
+        from trellis.utils.index_manager import parse_for_index
 
         content_path = Path(content_dir)
-        count = 0
 
-        try:
-            # Clear existing index
-            self.index_dir.mkdir(parents=True, exist_ok=True)
-            self._index = index.create_in(str(self.index_dir), self.schema)
-            writer = self._index.writer()
+        def documents():
+            # List everything first (frontmatter only), then extract the
+            # searchable text in parallel worker processes
+            # Each entry: (document fields without content, directory, filename)
+            listed = []
 
             garden_manager = GardenManager(content_dir)
             gardens = garden_manager.get_gardens()
 
-            # Index root-level pages
+            # Index root-level pages (order doesn't matter here)
             handler = MarkdownHandler(content_path, self.data_dir)
-            for item in handler.list_items():
+            for item in handler.list_items(sort=None):
                 if item.get('type') in ['markdown', 'page']:
-                    url = f"/page/{item['slug']}"
-                    writer.add_document(
-                        url=url,
-                        source_file=item['filename'],
-                        title=item['metadata'].get('title', ''),
-                        description=item['metadata'].get('description', ''),
-                        content=self._strip_html(item.get('content', '')),
-                        garden='',
-                        status=item['metadata'].get('status', 'published'),
-                    )
-                    count += 1
+                    listed.append(({
+                        'url': f"/page/{item['slug']}",
+                        'source_file': item['filename'],
+                        'title': item['metadata'].get('title', ''),
+                        'description': item['metadata'].get('description', ''),
+                        'garden': '',
+                        'status': item['metadata'].get('status', 'published'),
+                    }, content_path, item['filename']))
 
             # Index each garden
             for garden in gardens:
@@ -214,25 +286,65 @@ class SearchIndex:
                 # Recursively get all articles
                 for article in handler.list_articles(recursive=True):
                     if article.get('type') in ['markdown', 'page']:
-                        url = f"/garden/{garden['slug']}/{article['slug']}"
-                        writer.add_document(
-                            url=url,
-                            source_file=f"{garden['slug']}/{article['filename']}",
-                            title=article['metadata'].get('title', ''),
-                            description=article['metadata'].get('description', ''),
-                            content=self._strip_html(article.get('content', '')),
-                            garden=garden['slug'],
-                            status=article['metadata'].get('status', 'published'),
-                        )
-                        count += 1
-
-            writer.commit()
-            return count
+                        listed.append(({
+                            'url': f"/garden/{garden['slug']}/{article['slug']}",
+                            'source_file': f"{garden['slug']}/{article['filename']}",
+                            'title': article['metadata'].get('title', ''),
+                            'description': article['metadata'].get('description', ''),
+                            'garden': garden['slug'],
+                            'status': article['metadata'].get('status', 'published'),
+                        }, garden_path, article['filename']))
+
+            tasks = [(str(directory), str(self.data_dir), filename)
+                     for _, directory, filename in listed]
+            for (doc, _, _), parsed in zip(listed, parse_for_index(tasks)):
+                if parsed is None:
+                    continue
+                yield dict(doc, content=parsed[1])
 
+        try:
+            return self.rebuild_from_documents(documents())
         except Exception as e:
             print(f"Error rebuilding search index: {e}")
             raise
 
+    def rebuild_from_documents(self, documents):
+        """Replace the index contents with the given documents
+
+        Args:
+            documents: Iterable of dicts with add_document()'s keyword arguments
+
+        Returns:
+            Number of documents indexed
+        """
+        # Gather everything first so the count can pick the writer
+        documents = list(documents)
+
+        # Clear existing index
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._index = index.create_in(str(self.index_dir), self.schema)
+        with _INDEX_CACHE_LOCK:
+            _INDEX_CACHE[str(self.index_dir)] = self._index
+
+        cpus = os.cpu_count() or 1
+        if len(documents) >= MULTIPROC_WRITER_THRESHOLD and cpus > 1:
+            # Each helper process writes its own segment, kept as-is on commit
+            writer = self._index.writer(procs=max(2, cpus // 2), limitmb=256, multisegment=True)
+        else:
+            writer = self._index.writer(limitmb=256)
+
+        count = 0
+        try:
+            for doc in documents:
+                writer.add_document(**self._prepare_document(**doc))
+                count += 1
+        except Exception:
+            writer.cancel()
+            raise
+
+        writer.commit()
+        return count
+
     def get_document_count(self):
         """Get number of documents in the index"""
         try: